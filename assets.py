@@ -0,0 +1,64 @@
+"""
+Фоновая загрузка ресурсов
+"""
+import threading
+
+
+class AssetLoader:
+    """Загрузка ресурсов по списку задач в фоновом потоке
+
+    Задачи выполняются по порядку добавления; результат каждой становится
+    доступен сразу после её завершения, поэтому экран, которому нужны только
+    первые ресурсы, может заработать, пока грузятся остальные.
+    """
+
+    def __init__(self):
+        self.tasks = []     # (имя, функция)
+        self.results = {}   # имя -> результат готовой задачи
+        self.errors = {}    # имя -> исключение
+        self.current = None
+        self._thread = None
+
+    def add(self, name, func):
+        """Добавить задачу (до start)"""
+        self.tasks.append((name, func))
+
+    def start(self):
+        """Запуск фонового потока"""
+        self._thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+        self._thread.start()
+
+    def is_ready(self, name):
+        """Готов ли ресурс (задача завершилась, пусть и с ошибкой)"""
+        return name in self.results or name in self.errors
+
+    def get(self, name, default=None):
+        """Результат задачи (default, если она не готова или упала)"""
+        return self.results.get(name, default)
+
+    @property
+    def done(self):
+        """Все задачи завершены"""
+        return len(self.results) + len(self.errors) == len(self.tasks)
+
+    def progress(self):
+        """Доля завершённых задач от 0 до 1"""
+        if not self.tasks:
+            return 1.0
+        return (len(self.results) + len(self.errors)) / len(self.tasks)
+
+    def wait(self):
+        """Дождаться всех задач"""
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        """Фоновый поток: задачи по очереди"""
+        for name, func in self.tasks:
+            self.current = name
+            try:
+                self.results[name] = func()
+            except Exception as e:
+                print(f"Не удалось загрузить {name}: {e}")
+                self.errors[name] = e
+        self.current = None
@@ -0,0 +1,42 @@
+"""
+Сравнение двух файлов результатов бенчмарков
+
+Запуск:
+    python -m benchmarks.compare bench_before.json bench_after.json
+"""
+import argparse
+from benchmarks.stats import load_results
+
+
+def _rows(old, new):
+    """Пары (сценарий, фаза, метрика, старое, новое) для общих замеров"""
+    for name, new_scenario in new["scenarios"].items():
+        old_scenario = old["scenarios"].get(name)
+        if old_scenario is None:
+            continue
+        for phase, new_stats in new_scenario.items():
+            old_stats = old_scenario.get(phase)
+            if not isinstance(new_stats, dict) or not isinstance(old_stats, dict):
+                continue
+            for metric in ("mean_ms", "p95_ms", "p99_ms"):
+                if metric in new_stats and metric in old_stats:
+                    yield name, phase, metric, old_stats[metric], new_stats[metric]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарков")
+    parser.add_argument("old", help="базовый файл результатов")
+    parser.add_argument("new", help="новый файл результатов")
+    args = parser.parse_args()
+
+    old = load_results(args.old)
+    new = load_results(args.new)
+
+    print(f"{'сценарий':<32} {'фаза':<12} {'метрика':<8} {'было':>9} {'стало':>9} {'разница':>9}")
+    for name, phase, metric, before, after in _rows(old, new):
+        delta = (after - before) / before * 100 if before else 0.0
+        print(f"{name:<32} {phase:<12} {metric:<8} {before:9.3f} {after:9.3f} {delta:+8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Сценарные бенчмарки кадра: Game.update, CollisionSystem.check_collisions, Game.draw
+
+Запуск:
+    python -m benchmarks.frames --out bench_before.json
+    python -m benchmarks.frames --scenario "level 3 max enemies" --frames 2000
+    python -m benchmarks.compare bench_before.json bench_after.json
+"""
+import argparse
+import gc
+import random
+import time
+
+from headless import HeadlessShooter
+from settings import SCREEN_WIDTH
+from pool import ObjectPool
+from benchmarks.stats import summarize, environment, write_results
+
+
+class Scenario:
+    """Именованный сценарий: уровень, подготовка и действие перед каждым кадром"""
+
+    def __init__(self, name, level=1, setup=None, before_frame=None):
+        self.name = name
+        self.level = level
+        self.setup = setup
+        self.before_frame = before_frame
+
+
+def _spawn_boss(game):
+    """Убрать обычных врагов и вывести босса"""
+    game.level._kill_all_enemies()
+    game.level.spawn_boss()
+
+
+def _fill_enemies(game):
+    """Спавн без задержки - на экране всегда максимум врагов"""
+    game.level.compile(spawn_delay=0)
+
+
+def _boss_spiral(game, bullet_count=400):
+    """Держать на экране bullet_count пуль спирали босса"""
+    boss = next((e for e in game.enemies if e.is_boss), None)
+    if boss is None:
+        return
+    while len(game.enemy_bullets) < bullet_count:
+        angle = len(game.enemy_bullets) * 0.3
+        game.enemy_bullets.fire(boss.rect.centerx, boss.rect.centery, speed=4, angle=angle)
+
+
+def _explosions(game, explosion_count=50):
+    """Держать на экране частицы explosion_count взрывов"""
+    target = explosion_count * game.explosions.PARTICLES
+    while len(game.particles) < target:
+        x = random.randint(50, SCREEN_WIDTH - 50)
+        y = random.randint(50, 400)
+        game.explosions.emit(x, y)
+
+
+SCENARIOS = [
+    Scenario("level 1 cruise", level=1),
+    Scenario("level 3 max enemies", level=3, setup=_fill_enemies),
+    Scenario("boss bullet spiral", level=1, setup=_spawn_boss, before_frame=_boss_spiral),
+    Scenario("50 simultaneous explosions", level=1, before_frame=_explosions),
+    Scenario("4000 particles", level=1, before_frame=lambda game: _explosions(game, 200)),
+]
+
+
+def _timed(samples, func):
+    """Обёртка, записывающая время каждого вызова"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+        return result
+    return wrapper
+
+
+def run_scenario(shooter, scenario, frames, warmup, seed):
+    """Прогон одного сценария, результат - статистика по фазам"""
+    random.seed(seed)
+    game = shooter.new_game(scenario.level, seed=seed)
+    if scenario.setup:
+        scenario.setup(game)
+
+    update_samples = []
+    collision_samples = []
+    draw_samples = []
+    game.collision_system.check_collisions = _timed(
+        collision_samples, game.collision_system.check_collisions
+    )
+
+    perf_counter = time.perf_counter
+    gc_before = 0
+    for frame in range(warmup + frames):
+        if scenario.before_frame:
+            scenario.before_frame(game)
+        if shooter.autofire:
+            game.player.shoot()
+
+        start = perf_counter()
+        game.update()
+        middle = perf_counter()
+        game.draw(shooter.screen)
+        end = perf_counter()
+
+        if frame == warmup - 1:
+            collision_samples.clear()
+            gc_before = gc.get_stats()[0]["collections"]
+        if frame >= warmup:
+            update_samples.append(middle - start)
+            draw_samples.append(end - middle)
+
+    return {
+        "frames": frames,
+        "gc_collections": gc.get_stats()[0]["collections"] - gc_before,
+        "pools": {pool.name: pool.stats() for pool in ObjectPool.registry},
+        "update": summarize(update_samples),
+        "collisions": summarize(collision_samples),
+        "draw": summarize(draw_samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сценарные бенчмарки кадра")
+    parser.add_argument("--frames", type=int, default=600, help="кадров на сценарий")
+    parser.add_argument("--warmup", type=int, default=60, help="кадров прогрева")
+    parser.add_argument("--seed", type=int, default=1, help="seed генератора случайных чисел")
+    parser.add_argument("--scenario", action="append", help="запустить только указанный сценарий")
+    parser.add_argument("--out", default="bench_output.json", help="файл результатов (JSON)")
+    args = parser.parse_args()
+
+    selected = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if not selected:
+        parser.error("нет сценариев: " + ", ".join(s.name for s in SCENARIOS))
+
+    shooter = HeadlessShooter()
+    results = {"environment": environment(), "scenarios": {}}
+    for scenario in selected:
+        result = run_scenario(shooter, scenario, args.frames, args.warmup, args.seed)
+        results["scenarios"][scenario.name] = result
+        print(scenario.name)
+        for phase in ("update", "collisions", "draw"):
+            stats = result[phase]
+            print(f"  {phase:<11} mean {stats['mean_ms']:7.3f} мс  p50 {stats['p50_ms']:7.3f}  "
+                  f"p95 {stats['p95_ms']:7.3f}  p99 {stats['p99_ms']:7.3f}")
+        print(f"  сборок мусора (поколение 0): {result['gc_collections']}")
+
+    write_results(args.out, results)
+    print(f"Результаты сохранены в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
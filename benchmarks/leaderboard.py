@@ -0,0 +1,71 @@
+"""
+Время открытия таблицы результатов при большом числе записанных забегов
+
+Запуск:
+    python -m benchmarks.leaderboard --runs 50000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from leaderboard import Leaderboard
+from benchmarks.stats import summarize, environment, write_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Открытие таблицы результатов")
+    parser.add_argument("--runs", type=int, default=50000, help="сколько забегов записать")
+    parser.add_argument("--repeat", type=int, default=50, help="сколько раз открыть таблицу")
+    parser.add_argument("--seed", type=int, default=1, help="seed генератора забегов")
+    parser.add_argument("--out", default="bench_output.json", help="файл результатов (JSON)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.db")
+        board = Leaderboard(path)
+        for i in range(args.runs):
+            level = rng.randint(1, 3)
+            board.record(level, level, rng.randint(0, 20000), rng.randint(10000, 600000),
+                         rng.randint(0, 40), i)
+        board.close()
+
+        open_samples = []
+        cold_samples = []
+        warm_samples = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            board = Leaderboard(path)
+            opened = time.perf_counter()
+            # Как экран таблицы: общий топ и топ каждого уровня
+            for level in (None, 1, 2, 3):
+                board.top(10, level)
+            cold = time.perf_counter()
+            for level in (None, 1, 2, 3):
+                board.top(10, level)
+            warm = time.perf_counter()
+            board.close()
+            open_samples.append(opened - start)
+            cold_samples.append(cold - opened)
+            warm_samples.append(warm - cold)
+
+    results = {
+        "environment": environment(),
+        "scenarios": {
+            f"{args.runs} runs": {
+                "open": summarize(open_samples),
+                "top_cold": summarize(cold_samples),
+                "top_cached": summarize(warm_samples),
+            }
+        },
+    }
+    for name, stats in results["scenarios"][f"{args.runs} runs"].items():
+        print(f"{name:<11} mean {stats['mean_ms']:7.3f} мс  p95 {stats['p95_ms']:7.3f}")
+    write_results(args.out, results)
+    print(f"Результаты сохранены в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Узкая фаза: ступенчатая проверка (rect -> круг -> маска) против маски на каждой паре
+
+Запуск:
+    python -m benchmarks.narrow_phase --out bench_narrow.json
+"""
+import argparse
+import random
+import time
+
+import pygame
+from headless import HeadlessShooter
+from enemies import BossEnemy
+from bullets import Bullet
+from collision import narrow_phase, circle_mask
+from benchmarks.stats import summarize, environment, write_results
+
+
+class Shot(pygame.sprite.Sprite):
+    """Круглая пуля врага как отдельный спрайт"""
+
+    collision_shape = "circle"
+    radius = 4
+
+    def __init__(self):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, self.radius * 2, self.radius * 2)
+        self.mask = circle_mask(self.radius)
+
+
+def make_pairs(game, rng, count, spread):
+    """Пары (цель, пуля): пули вокруг игрока и босса"""
+    boss = BossEnemy(400, 100, level=1)
+    pairs = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            target = game.player
+            bullet = Shot()
+        else:
+            target = boss
+            bullet = Bullet(0, 0, -1)
+        bullet.rect.center = (target.rect.centerx + rng.randint(-spread, spread),
+                              target.rect.centery + rng.randint(-spread, spread))
+        pairs.append((target, bullet))
+    return pairs
+
+
+def measure(pairs, check, rounds):
+    """Время одного прохода по всем парам и итоговые результаты"""
+    samples = []
+    results = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [check(target, bullet) for target, bullet in pairs]
+        samples.append(time.perf_counter() - start)
+    return samples, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стоимость узкой фазы столкновений")
+    parser.add_argument("--pairs", type=int, default=2000, help="число пар")
+    parser.add_argument("--spread", type=int, default=60, help="разброс пуль вокруг цели, пикселей")
+    parser.add_argument("--rounds", type=int, default=50, help="повторов")
+    parser.add_argument("--seed", type=int, default=1, help="seed расстановки")
+    parser.add_argument("--out", default="bench_output.json", help="файл результатов (JSON)")
+    args = parser.parse_args()
+
+    shooter = HeadlessShooter()
+    game = shooter.new_game(1, seed=args.seed)
+    pairs = make_pairs(game, random.Random(args.seed), args.pairs, args.spread)
+
+    tiered_samples, tiered = measure(pairs, narrow_phase, args.rounds)
+    mask_samples, masked = measure(pairs, pygame.sprite.collide_mask, args.rounds)
+    rect_hits = sum(1 for target, bullet in pairs if target.rect.colliderect(bullet.rect))
+    mask_hits = sum(1 for hit in masked if hit)
+    mismatches = sum(1 for a, b in zip(tiered, masked) if bool(a) != bool(b))
+
+    results = {
+        "environment": environment(),
+        "scenarios": {
+            f"{args.pairs} pairs": {
+                "tiered": summarize(tiered_samples),
+                "mask_every_pair": summarize(mask_samples),
+                "rect_hits": rect_hits,
+                "mask_hits": mask_hits,
+                "mismatches": mismatches,
+            }
+        },
+    }
+    print(f"rect-попаданий: {rect_hits}, пиксельных: {mask_hits}, расхождений с маской: {mismatches}")
+    print(f"ступени:          {results['scenarios'][f'{args.pairs} pairs']['tiered']['mean_ms']:.3f} мс")
+    print(f"маска на каждой:  {results['scenarios'][f'{args.pairs} pairs']['mask_every_pair']['mean_ms']:.3f} мс")
+
+    write_results(args.out, results)
+    print(f"Результаты сохранены в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
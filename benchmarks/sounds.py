@@ -0,0 +1,61 @@
+"""
+Загрузка звуков при запуске: холодный кэш (декодирование MP3) против тёплого (готовый PCM)
+
+Запуск:
+    python -m benchmarks.sounds --repeat 20
+"""
+import os
+
+# Звук не нужен, нужен только микшер
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import tempfile
+import time
+
+import pygame
+from sounds import SoundManager
+from sound_cache import SoundCache
+from benchmarks.stats import summarize, environment, write_results
+
+
+def load_all(cache):
+    """Время загрузки всех звуков SoundManager, в секундах"""
+    start = time.perf_counter()
+    manager = SoundManager(cache)
+    elapsed = time.perf_counter() - start
+    if not manager.enabled:
+        raise RuntimeError("звуки не загрузились")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Холодный и тёплый запуск звуков")
+    parser.add_argument("--repeat", type=int, default=20, help="число замеров каждого вида")
+    parser.add_argument("--out", default="bench_output.json", help="файл результатов (JSON)")
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    cold_samples = []
+    warm_samples = []
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SoundCache(directory)
+        for _ in range(args.repeat):
+            cache.clear()
+            cold_samples.append(load_all(cache))
+            warm_samples.append(load_all(cache))
+
+    results = {
+        "environment": environment(),
+        "scenarios": {
+            "sound startup": {"cold": summarize(cold_samples), "warm": summarize(warm_samples)},
+        },
+    }
+    for name, stats in results["scenarios"]["sound startup"].items():
+        print(f"{name:<5} mean {stats['mean_ms']:7.3f} мс  p95 {stats['p95_ms']:7.3f}")
+    write_results(args.out, results)
+    print(f"Результаты сохранены в {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Статистика замеров и сохранение результатов
+"""
+import json
+import math
+import platform
+import time
+import pygame
+
+
+def percentile(sorted_values, fraction):
+    """Перцентиль по отсортированному списку (метод ближайшего ранга)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """Среднее и перцентили для списка замеров в секундах, результат в мс"""
+    values = sorted(s * 1000 for s in samples)
+    count = len(values)
+    return {
+        "samples": count,
+        "mean_ms": sum(values) / count if count else 0.0,
+        "p50_ms": percentile(values, 0.50),
+        "p95_ms": percentile(values, 0.95),
+        "p99_ms": percentile(values, 0.99),
+    }
+
+
+def environment():
+    """Описание окружения, в котором сделан замер"""
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_results(path, results):
+    """Сохранение результатов в JSON"""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path):
+    """Загрузка результатов из JSON"""
+    with open(path, "r") as f:
+        return json.load(f)
@@ -3,101 +3,402 @@
 """
 import pygame
 import math
+import heapq
+import numpy as np
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_SPEED,
     ENEMY_BULLET_SPEED, WHITE, YELLOW, RED, ORANGE
 )
+from collision import circle_mask, rect_mask, narrow_phase
+from pool import ObjectPool, PooledSprite
+from image_cache import images
 
 
-class Bullet(pygame.sprite.Sprite):
-    """Пуля игрока"""
+def exit_step(position, velocity, low, high):
+    """Первый шаг k >= 1, на котором position + velocity * k выходит за [low, high]
+
+    Координата без скорости, оставшаяся внутри, не выходит никогда (math.inf).
+    """
+    def outside(k):
+        p = position + velocity * k
+        return p < low or p > high
+
+    # Уже снаружи после первого шага (например, выстрел из-за верхнего края)
+    if outside(1):
+        return 1
+    if not velocity:
+        return math.inf
+    if velocity > 0:
+        k = max(int((high - position) // velocity) + 1, 1)
+    else:
+        k = max(int((position - low) // -velocity) + 1, 1)
+    if k > 2 ** 40:
+        # Скорость - остаток округления (sin(pi) * speed), по этой оси снаряд не уходит
+        return math.inf
+
+    # Деление в float может ошибиться на шаг - сверка по той же формуле, что и позиция
+    while k > 1 and outside(k - 1):
+        k -= 1
+    while not outside(k):
+        k += 1
+    return k
+
+
+class Bullet(PooledSprite):
+    """Пуля игрока (берётся из Bullet.pool, при kill() возвращается туда же)
+
+    Летит в PlayerBulletField: позиция считается в массивах поля, а rect
+    пули выставляется только для точной проверки попадания.
+    """
+
+    collision_shape = "rect"
 
     def __init__(self, x, y, direction=1):
         super().__init__()
+        self.direction = None
+        self.reset(x, y, direction)
+
+    def reset(self, x, y, direction=1):
+        """Подготовка пули к повторному использованию"""
         self.speed = BULLET_SPEED * direction
+        if direction != self.direction:
+            self.image = images.image(("bullet", direction), lambda: self.create_image(direction))
+            self.rect = self.image.get_rect()
+            self.mask = rect_mask(self.rect.size)
         self.direction = direction  # -1 вверх, 1 вниз
 
-        # Создание изображения пули
-        self.image = pygame.Surface((6, 15), pygame.SRCALPHA)
+        self.rect.centerx = x
+        self.rect.centery = y
+
+        # Урон
+        self.damage = 25
+
+    def create_image(self, direction):
+        """Создание изображения пули"""
+        image = pygame.Surface((6, 15), pygame.SRCALPHA)
 
         # Градиентная пуля
         for i in range(15):
             alpha = 255 - i * 10
             color = (255, 255, 0, alpha) if direction == -1 else (255, 100, 0, alpha)
-            pygame.draw.rect(self.image, color, (0, i, 6, 1))
+            pygame.draw.rect(image, color, (0, i, 6, 1))
 
         # Светящийся кончик
-        pygame.draw.circle(self.image, WHITE, (3, 0 if direction == -1 else 14), 3)
+        pygame.draw.circle(image, WHITE, (3, 0 if direction == -1 else 14), 3)
 
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
+        return image
 
-        # Урон
-        self.damage = 25
+
+Bullet.pool = ObjectPool(Bullet)
+
+
+class ProjectileField:
+    """Снаряды с постоянной скоростью: точка и шаг запуска в массивах NumPy
+
+    Снаряд летит по прямой, поэтому его позиция - x0 + vx * (step - spawn)
+    и считается векторно только для проверки попаданий и отрисовки.
+    Шаг вылета за экран вычисляется при выстреле и кладётся в кучу:
+    update() лишь двигает номер шага и освобождает слоты вылетевших снарядов.
+    Слоты переиспользуются, номер запуска в слоте отличает живой снаряд
+    от записи в куче, оставшейся от прежнего.
+    """
+
+    FIELDS = ("x0", "y0", "vx", "vy", "spawn", "launch_id", "active")
+
+    def __init__(self, capacity=256):
+        self.x0 = np.zeros(capacity)
+        self.y0 = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.spawn = np.zeros(capacity)
+        self.launch_id = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.clear()
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Удвоение ёмкости массивов"""
+        capacity = len(self.x0) * 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.used] = old[:self.used]
+            setattr(self, name, new)
+
+    def _launch(self, x, y, vx, vy, steps):
+        """Занять слот под снаряд, который вылетит через steps шагов; возвращает слот"""
+        if self.free:
+            i = self.free.pop()
+        else:
+            if self.used == len(self.x0):
+                self._grow()
+            i = self.used
+            self.used += 1
+        self.x0[i] = x
+        self.y0[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.spawn[i] = self.step
+        self.launches += 1
+        self.launch_id[i] = self.launches
+        self.active[i] = True
+        self.count += 1
+        self._live = None
+        heapq.heappush(self.expiry, (self.step + steps, self.launches, i))
+        return i
+
+    def _release(self, i):
+        """Освободить слот снаряда"""
+        self.active[i] = False
+        self.free.append(i)
+        self.count -= 1
+        self._live = None
+        if not self.count:
+            # Все слоты свободны - занятая часть массивов начинается заново
+            self.used = 0
+            self.free.clear()
 
     def update(self):
-        """Обновление позиции пули"""
-        self.rect.y += self.speed
+        """Один шаг движения: освобождение слотов снарядов, вылетевших за экран"""
+        self.step += 1
+        expiry = self.expiry
+        launch_id = self.launch_id
+        while expiry and expiry[0][0] <= self.step:
+            _, launch, i = heapq.heappop(expiry)
+            if launch_id[i] == launch and self.active[i]:
+                self._release(i)
 
-        # Удаление пули за пределами экрана
-        if self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT:
-            self.kill()
+    def live(self):
+        """Позиции снарядов в слотах [0, used) на текущем шаге и маска живых
 
+        Маска - None, если свободных слотов нет. Результат кэшируется
+        до следующего шага, выстрела или удаления.
+        """
+        live = self._live
+        if live is None or live[0] != self.step:
+            n = self.used
+            k = self.step - self.spawn[:n]
+            x = self.x0[:n] + self.vx[:n] * k
+            y = self.y0[:n] + self.vy[:n] * k
+            mask = self.active[:n] if self.free else None
+            live = self._live = (self.step, mask, x, y)
+        return live[1:]
 
-class EnemyBullet(pygame.sprite.Sprite):
-    """Пуля врага"""
+    def remove(self, indices):
+        """Удаление снарядов по слотам"""
+        for i in indices:
+            self._release(i)
 
-    def __init__(self, x, y, speed=None, angle=0):
-        super().__init__()
+    def clear(self):
+        """Удаление всех снарядов"""
+        self.active[:] = False
+        self.count = 0
+        self.used = 0      # слоты [0, used) хоть раз заняты с последнего опустошения
+        self.free = []
+        self.expiry = []   # (шаг вылета, номер запуска, слот)
+        self.launches = 0
+        self.step = 0
+        self._live = None
+
+
+class BulletField(ProjectileField):
+    """Пули врагов: круги с общим изображением, урон - в отдельном массиве"""
+
+    collision_shape = "circle"
+    radius = 4
+
+    FIELDS = ProjectileField.FIELDS + ("damage",)
+
+    def __init__(self, capacity=256):
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        super().__init__(capacity)
+
+        # Общее изображение и маска всех пуль
+        self.image = images.image(("enemy_bullet", self.radius), self.create_image)
+        self.mask = circle_mask(self.radius)
+
+        # Пуля-кандидат для narrow_phase: форма, радиус и маска поля, rect ставит collide
+        self.probe = pygame.sprite.Sprite()
+        self.probe.rect = pygame.Rect(0, 0, self.radius * 2, self.radius * 2)
+        self.probe.collision_shape = self.collision_shape
+        self.probe.radius = self.radius
+        self.probe.mask = self.mask
+
+    def create_image(self):
+        """Создание изображения пули"""
+        size = self.radius * 2
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(image, RED, (self.radius, self.radius), self.radius)
+        pygame.draw.circle(image, ORANGE, (self.radius, self.radius), self.radius // 2)
+        return image
+
+    def fire(self, x, y, speed=None, angle=0, damage=10):
+        """Выпустить пулю (angle в радианах отклоняет её по горизонтали)"""
         # Фиксированная скорость пули, не зависящая от врага
-        self.speed = speed if speed else ENEMY_BULLET_SPEED
-        self.angle = angle  # Угол в радианах
-        self.vel_x = math.sin(angle) * self.speed if angle else 0
-        self.vel_y = self.speed
+        speed = speed if speed else ENEMY_BULLET_SPEED
+        vx = math.sin(angle) * speed if angle else 0
+        vy = speed
+        r = self.radius
+        steps = min(exit_step(x, vx, -r, SCREEN_WIDTH + r), exit_step(y, vy, -r, SCREEN_HEIGHT + r))
+        i = self._launch(x, y, vx, vy, steps)
+        self.damage[i] = damage
 
-        # Создание изображения пули
-        self.image = pygame.Surface((8, 8), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, RED, (4, 4), 4)
-        pygame.draw.circle(self.image, ORANGE, (4, 4), 2)
+    def centers(self):
+        """Центры только живых пуль"""
+        mask, x, y = self.live()
+        if mask is not None:
+            return x[mask], y[mask]
+        return x, y
 
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
+    def collide(self, sprite):
+        """Слоты пуль, попавших в спрайт (векторный отсев по rect, затем narrow_phase)"""
+        if not self.count:
+            return []
+        r = self.radius
+        rect = sprite.rect
+        mask, x, y = self.live()
+        # Отсев по rect сразу для всех пуль
+        inside = (x + r > rect.left) & (x - r < rect.right) & (y + r > rect.top) & (y - r < rect.bottom)
+        if mask is not None:
+            inside &= mask
+        candidates = np.flatnonzero(inside)
+        if not len(candidates):
+            return []
 
-        self.damage = 10
+        # Кандидаты проверяются общей узкой фазой через пробный спрайт-круг
+        probe = self.probe
+        hits = []
+        for i in candidates.tolist():
+            probe.rect.center = (int(x[i]), int(y[i]))
+            if narrow_phase(sprite, probe):
+                hits.append(i)
+        return hits
 
-    def update(self):
-        """Обновление позиции пули"""
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
+    def positions(self):
+        """Центры пуль списком (x, y)"""
+        x, y = self.centers()
+        return list(zip(x.tolist(), y.tolist()))
 
-        # Удаление пули за пределами экрана
-        if (self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT or
-            self.rect.right < 0 or self.rect.left > SCREEN_WIDTH):
-            self.kill()
+    def draw(self, surface):
+        """Отрисовка всех пуль одним вызовом blits"""
+        if not self.count:
+            return
+        r = self.radius
+        x, y = self.centers()
+        xs = (x - r).astype(np.int32).tolist()
+        ys = (y - r).astype(np.int32).tolist()
+        image = self.image
+        surface.blits([(image, pos) for pos in zip(xs, ys)], doreturn=False)
 
 
-class PowerUpBullet(pygame.sprite.Sprite):
-    """Бонусная пуля (усиление)"""
+class PlayerBulletField(ProjectileField):
+    """Пули игрока: полёт в массивах поля, объект Bullet - для точной проверки и отрисовки
 
-    def __init__(self, x, y):
-        super().__init__()
-        self.speed = BULLET_SPEED * -1
+    Левый верхний угол считается по формуле для всех слотов сразу, и отсев
+    по rect врагов - одна векторная операция. rect объекта Bullet выставляется
+    только у кандидатов перед narrow_phase. Освобождённый слот возвращает
+    свою пулю в Bullet.pool.
+    """
 
-        self.image = pygame.Surface((8, 20), pygame.SRCALPHA)
-        pygame.draw.rect(self.image, (0, 255, 255), (0, 0, 8, 20))
-        pygame.draw.rect(self.image, WHITE, (2, 0, 4, 20))
+    FIELDS = ProjectileField.FIELDS + ("w", "h")
 
-        self.rect = self.image.get_rect()
-        self.rect.centerx = x
-        self.rect.centery = y
+    def __init__(self, capacity=64):
+        self.w = np.zeros(capacity)
+        self.h = np.zeros(capacity)
+        self.bullets = []  # слот -> Bullet (None у свободного слота)
+        super().__init__(capacity)
 
-        self.damage = 50
+    def launch(self, bullet):
+        """Запустить пулю из её текущего rect"""
+        rect = bullet.rect
+        steps = exit_step(rect.top, bullet.speed, -rect.height, SCREEN_HEIGHT)
+        i = self._launch(rect.x, rect.y, 0, bullet.speed, steps)
+        self.w[i] = rect.width
+        self.h[i] = rect.height
+        if i == len(self.bullets):
+            self.bullets.append(bullet)
+        else:
+            self.bullets[i] = bullet
 
-    def update(self):
-        """Обновление позиции пули"""
-        self.rect.y += self.speed
+    def _release(self, i):
+        """Освободить слот и вернуть пулю в пул"""
+        bullet = self.bullets[i]
+        self.bullets[i] = None
+        super()._release(i)
+        bullet.kill()
+
+    def collide_group(self, sprites):
+        """Попадания в спрайты группы: {спрайт: слоты пуль}
+
+        Отсев по rect - одна векторная операция на все пары спрайт-пуля,
+        дальше пары идут по порядку спрайтов, и пуля достаётся первому
+        спрайту, с которым прошла narrow_phase.
+        """
+        if not self.count or not sprites:
+            return {}
+        sprites = sprites.sprites()
+        rects = np.array([tuple(sprite.rect) for sprite in sprites], dtype=float)
+        left = rects[:, 0:1]
+        top = rects[:, 1:2]
+        right = left + rects[:, 2:3]
+        bottom = top + rects[:, 3:4]
+        mask, x, y = self.live()
+        n = self.used
+        # То же условие, что у Rect.colliderect
+        inside = (x < right) & (x + self.w[:n] > left) & (y < bottom) & (y + self.h[:n] > top)
+        if mask is not None:
+            inside &= mask
+        rows, slots = np.nonzero(inside)
+        if not len(slots):
+            return {}
+
+        hits = {}
+        taken = set()
+        bullets = self.bullets
+        for row, i in zip(rows.tolist(), slots.tolist()):
+            if i in taken:
+                continue
+            sprite = sprites[row]
+            bullet = bullets[i]
+            bullet.rect.topleft = (int(x[i]), int(y[i]))
+            if narrow_phase(sprite, bullet):
+                taken.add(i)
+                hits.setdefault(sprite, []).append(i)
+        return hits
+
+    def clear(self):
+        """Удаление всех пуль с возвратом в пул"""
+        for bullet in self.bullets:
+            if bullet is not None:
+                bullet.kill()
+        self.bullets = []
+        super().clear()
+
+    def slots(self):
+        """Слоты живых пуль"""
+        mask, _, _ = self.live()
+        if mask is None:
+            return range(self.used)
+        return np.flatnonzero(mask).tolist()
+
+    def rects(self):
+        """Прямоугольники живых пуль списком (x, y, ширина, высота)"""
+        _, x, y = self.live()
+        xs = x.astype(np.int64).tolist()
+        ys = y.astype(np.int64).tolist()
+        w = self.w
+        h = self.h
+        return [(xs[i], ys[i], int(w[i]), int(h[i])) for i in self.slots()]
+
+    def draw(self, surface):
+        """Отрисовка всех пуль одним вызовом blits"""
+        if not self.count:
+            return
+        _, x, y = self.live()
+        xs = x.astype(np.int32).tolist()
+        ys = y.astype(np.int32).tolist()
+        bullets = self.bullets
+        surface.blits([(bullets[i].image, (xs[i], ys[i])) for i in self.slots()], doreturn=False)
 
-        if self.rect.bottom < 0:
-            self.kill()
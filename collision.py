@@ -1,8 +1,84 @@
 """
 Система столкновений и система очков
 """
+import math
 import pygame
 from settings import WHITE, YELLOW, GREEN
+from fonts import texts
+
+
+# Кэш масок для простых форм: круги по радиусу, прямоугольники по размеру
+_circle_masks = {}
+_rect_masks = {}
+
+
+def circle_mask(radius):
+    """Маска круга заданного радиуса (строится один раз)"""
+    mask = _circle_masks.get(radius)
+    if mask is None:
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surface, WHITE, (radius, radius), radius)
+        mask = _circle_masks[radius] = pygame.mask.from_surface(surface)
+    return mask
+
+
+def rect_mask(size):
+    """Сплошная маска прямоугольника (строится один раз)"""
+    mask = _rect_masks.get(size)
+    if mask is None:
+        mask = _rect_masks[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+
+def bounding_radius(rect):
+    """Радиус окружности, описанной вокруг rect"""
+    return math.hypot(rect.width, rect.height) / 2
+
+
+def circle_hits_rect(center, radius, rect):
+    """Пересечение круга с прямоугольником"""
+    cx, cy = center
+    nearest_x = min(max(cx, rect.left), rect.right - 1)
+    nearest_y = min(max(cy, rect.top), rect.bottom - 1)
+    dx = cx - nearest_x
+    dy = cy - nearest_y
+    return dx * dx + dy * dy <= radius * radius
+
+
+def narrow_phase(a, b):
+    """Точная проверка пары: rect -> круг -> маска
+
+    Каждый участник объявляет форму в collision_shape ("rect", "circle" или "mask")
+    и несёт radius и mask (у простых форм - общие маски из кэша). Круговой тест
+    отсекает пары с круглыми снарядами, а попиксельная проверка выполняется
+    только для пар с маской, переживших дешёвые тесты.
+    """
+    rect_a = a.rect
+    rect_b = b.rect
+    if not rect_a.colliderect(rect_b):
+        return False
+
+    shape_a = a.collision_shape
+    shape_b = b.collision_shape
+    if shape_a == "mask" or shape_b == "mask":
+        if shape_a == "circle" or shape_b == "circle":
+            dx = rect_a.centerx - rect_b.centerx
+            dy = rect_a.centery - rect_b.centery
+            reach = a.radius + b.radius
+            if dx * dx + dy * dy > reach * reach:
+                return False
+        return a.mask.overlap(b.mask, (rect_b.x - rect_a.x, rect_b.y - rect_a.y)) is not None
+
+    if shape_a == "circle" and shape_b == "circle":
+        dx = rect_a.centerx - rect_b.centerx
+        dy = rect_a.centery - rect_b.centery
+        reach = a.radius + b.radius
+        return dx * dx + dy * dy <= reach * reach
+    if shape_a == "circle":
+        return circle_hits_rect(rect_a.center, a.radius, rect_b)
+    if shape_b == "circle":
+        return circle_hits_rect(rect_b.center, b.radius, rect_a)
+    return True
 
 
 class CollisionSystem:
@@ -19,74 +95,70 @@ class CollisionSystem:
 
     def check_player_bullets_hit_enemies(self):
         """Проверка попадания пуль игрока во врагов"""
-        hits = pygame.sprite.groupcollide(
-            self.game.enemies,
-            self.game.player_bullets,
-            False,
-            True
-        )
+        # То же, что groupcollide(enemies, player_bullets, False, True):
+        # пуля достаётся первому врагу, с которым пересеклась.
+        # Поле пуль отсеивает пары по rect векторно, сетка ему не нужна
+        bullets = self.game.player_bullets
+        hits = {}
+        for enemy, slots in bullets.collide_group(self.game.enemies).items():
+            hits[enemy] = [bullets.bullets[i].damage for i in slots]
+            bullets.remove(slots)
 
         # Используем list() для безопасной итерации
         for enemy in list(hits.keys()):
             if enemy not in self.game.enemies:
                 continue
-            bullets = hits[enemy]
-            for bullet in bullets:
-                damaged = enemy.take_damage(bullet.damage)
+            for damage in hits[enemy]:
+                damaged = enemy.take_damage(damage)
                 if damaged:
                     # Враг уничтожен
                     self.game.score.add_score(enemy.score_value)
+                    self.game.kills += 1
                     if self.game.level:
                         self.game.level.on_enemy_defeated(enemy)
 
                     # Эффект взрыва
-                    from effects import Explosion
-                    explosion = Explosion(enemy.rect.centerx, enemy.rect.centery)
-                    self.game.all_sprites.add(explosion)
+                    self.game.explosions.emit(enemy.rect.centerx, enemy.rect.centery)
 
                     # Звук взрыва
                     if self.game.sound_manager:
                         self.game.sound_manager.play("explosion")
 
                     # Всплывающие очки
-                    from effects import ScorePopup
-                    popup = ScorePopup(enemy.rect.centerx, enemy.rect.centery,
-                                      f"+{enemy.score_value}", YELLOW)
-                    self.game.score_popups.append(popup)
+                    self.game.popups.spawn(enemy.rect.centerx, enemy.rect.centery,
+                                           f"+{enemy.score_value}", YELLOW)
                     break
 
     def check_enemy_bullets_hit_player(self):
         """Проверка попадания пуль врагов в игрока"""
-        hits = pygame.sprite.spritecollide(
-            self.game.player,
-            self.game.enemy_bullets,
-            True
-        )
-
-        for bullet in hits:
-            self.game.player.take_damage(bullet.damage)
+        # Поле пуль проверяет все пули разом, сетка ему не нужна
+        bullets = self.game.enemy_bullets
+        hits = bullets.collide(self.game.player)
+        damages = [int(bullets.damage[i]) for i in hits]
+        bullets.remove(hits)
+
+        for damage in damages:
+            self.game.player.take_damage(damage)
             # Звук получения урона
             if self.game.sound_manager:
                 self.game.sound_manager.play("player_hit")
 
     def check_enemies_collide_player(self):
         """Проверка столкновения врагов с игроком"""
-        hits = pygame.sprite.spritecollide(
-            self.game.player,
-            self.game.enemies,
-            False
-        )
+        # Запрос один на кадр - сетка врагов не окупила бы своей синхронизации
+        player = self.game.player
+        rect = player.rect
+        hits = [e for e in self.game.enemies if rect.colliderect(e.rect) and narrow_phase(player, e)]
 
         for enemy in hits:
             damaged = enemy.take_damage(50)
             if damaged:
                 self.game.score.add_score(enemy.score_value)
+                self.game.kills += 1
                 if self.game.level:
                     self.game.level.on_enemy_defeated(enemy)
 
-                from effects import Explosion
-                explosion = Explosion(enemy.rect.centerx, enemy.rect.centery)
-                self.game.all_sprites.add(explosion)
+                self.game.explosions.emit(enemy.rect.centerx, enemy.rect.centery)
                 
                 # Звук взрыва
                 if self.game.sound_manager:
@@ -98,51 +170,44 @@ class CollisionSystem:
 class Score:
     """Система подсчёта очков"""
 
-    def __init__(self):
+    def __init__(self, store=None, leaderboard=None):
         self.score = 0
-        self.high_score = self.load_high_score()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        # Хранилище рекорда (HighScoreStore); без него рекорд живёт только в памяти
+        self.store = store
+        self.high_score = store.value if store else 0
+        # Лучший забег из таблицы результатов, если он выше сохранённого рекорда
+        if leaderboard:
+            self.high_score = max(self.high_score, leaderboard.best())
 
     def add_score(self, points):
         """Добавление очков"""
         self.score += points
         if self.score > self.high_score:
             self.high_score = self.score
-            self.save_high_score()
+            if self.store:
+                self.store.submit(self.score)
 
     def reset(self):
         """Сброс очков"""
         self.score = 0
 
-    def load_high_score(self):
-        """Загрузка рекорда"""
-        try:
-            with open("highscore.txt", "r") as f:
-                return int(f.read().strip())
-        except (FileNotFoundError, ValueError):
-            return 0
-
-    def save_high_score(self):
-        """Сохранение рекорда"""
-        try:
-            with open("highscore.txt", "w") as f:
-                f.write(str(self.high_score))
-        except IOError:
-            pass
+    def flush(self):
+        """Записать рекорд на диск в фоне (конец уровня или игры)"""
+        if self.store:
+            self.store.flush_soon()
 
     def draw(self, surface, x, y):
         """Отрисовка счёта"""
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+        score_text = texts.render(f"Score: {self.score}", 36, WHITE)
         score_rect = score_text.get_rect(topright=(x, y))
         surface.blit(score_text, score_rect)
 
-        highscore_text = self.small_font.render(f"Best: {self.high_score}", True, YELLOW)
+        highscore_text = texts.render(f"Best: {self.high_score}", 24, YELLOW)
         highscore_rect = highscore_text.get_rect(topright=(x, y + 30))
         surface.blit(highscore_text, highscore_rect)
 
     def draw_centered(self, surface, y, color=WHITE):
         """Отрисовка счёта по центру"""
-        score_text = self.font.render(f"Score: {self.score}", True, color)
+        score_text = texts.render(f"Score: {self.score}", 36, color)
         score_rect = score_text.get_rect(centerx=surface.get_width() // 2, top=y)
         surface.blit(score_text, score_rect)
@@ -2,179 +2,393 @@
 Визуальные эффекты
 """
 import pygame
+import math
 import random
+from collections import deque
+from itertools import islice
+import numpy as np
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, YELLOW, RED, ORANGE
+from pool import ObjectPool
+from image_cache import images
+from fonts import texts
 
 
-class Explosion(pygame.sprite.Sprite):
-    """Эффект взрыва"""
-    
-    def __init__(self, x, y, color=YELLOW, size=30, duration=500):
-        super().__init__()
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = size
-        self.duration = duration
-        self.start_time = pygame.time.get_ticks()
-        self.max_radius = size
-        self.particles = []
-        
-        # Создание частиц
-        for _ in range(20):
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-5, 5),
-                'vy': random.uniform(-5, 5),
-                'life': random.randint(20, 40),
-                'color': random.choice([color, YELLOW, ORANGE, RED]),
-                'size': random.randint(2, 5)
-            })
-        
-        self.image = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-    
+class ParticleSystem:
+    """Все частицы игры: позиции, скорости, жизнь, размер и цвет в массивах NumPy
+
+    Шаг симуляции - одна векторная операция на все частицы, отрисовка - один
+    вызов blits с заранее отрисованными кружками (радиус и прозрачность квантуются).
+    Элементы списка blits - постоянные пары [изображение, Rect], которые
+    переписываются на месте, поэтому кадр не создаёт объектов на каждую частицу.
+    Взрывы и двигатели только выпускают частицы в систему.
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "life", "fade", "size", "shrink", "color")
+    ALPHA_LEVELS = 16
+
+    def __init__(self, clock, capacity=1024, seed=None):
+        self.clock = clock
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.fade = np.ones(capacity)      # жизнь, при которой частица полностью непрозрачна
+        self.size = np.zeros(capacity)
+        self.shrink = np.zeros(capacity)   # уменьшение размера за кадр
+        self.color = np.zeros(capacity, dtype=np.int32)  # индекс в палитре
+
+        # Палитра цветов и кэш изображений частиц по коду (цвет, радиус, прозрачность)
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = {}
+        self.blits = []  # [изображение, Rect] на каждую видимую частицу, растёт по необходимости
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        """Увеличение ёмкости массивов до needed и больше"""
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def color_index(self, color):
+        """Индекс цвета в палитре (новый цвет добавляется)"""
+        color = tuple(color[:3])
+        index = self.palette_index.get(color)
+        if index is None:
+            index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def emit(self, x, y, vx, vy, life, size, color, fade, shrink):
+        """Выпустить частицы; аргументы - числа или массивы одной длины"""
+        n = len(np.atleast_1d(vx))
+        start = self.count
+        end = start + n
+        if end > len(self.x):
+            self._grow(end)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = vx
+        self.vy[start:end] = vy
+        self.life[start:end] = life
+        self.size[start:end] = size
+        self.color[start:end] = color
+        self.fade[start:end] = fade
+        self.shrink[start:end] = shrink
+        self.count = end
+
     def update(self):
-        """Обновление эффекта"""
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - self.start_time
-        
-        # Очистка поверхности
-        self.image.fill((0, 0, 0, 0))
-        
-        # Обновление и отрисовка частиц
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['size'] = max(0, particle['size'] - 0.1)
-            
-            if particle['life'] <= 0 or particle['size'] <= 0:
-                self.particles.remove(particle)
-                continue
-            
-            # Отрисовка частицы
-            alpha = int(255 * (particle['life'] / 40))
-            color = (*particle['color'][:3], alpha)
-            pygame.draw.circle(self.image, color, 
-                             (int(particle['x'] - self.rect.x), int(particle['y'] - self.rect.y)), 
-                             int(particle['size']))
-        
-        # Удаление эффекта, когда все частицы исчезли
-        if not self.particles or elapsed > self.duration:
-            self.kill()
+        """Движение, старение и удаление погасших частиц"""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= 1
+        self.size[:n] -= self.shrink[:n]
+
+        keep = (self.life[:n] > 0) & (self.size[:n] > 0)
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def clear(self):
+        """Удаление всех частиц"""
+        self.count = 0
+
+    def _sprite(self, code):
+        """Изображение частицы по коду (цвет, радиус, уровень прозрачности)"""
+        rest, level = divmod(code, self.ALPHA_LEVELS)
+        index, radius = divmod(rest, 8)
+        color = (*self.palette[index], level * 255 // (self.ALPHA_LEVELS - 1))
+
+        def build():
+            image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (radius, radius), radius)
+            return image
+
+        sprite = self.sprites[code] = images.image(("particle", color, radius), build)
+        return sprite
+
+    def draw(self, surface):
+        """Отрисовка всех частиц одним вызовом blits"""
+        n = self.count
+        if not n:
+            return
+        radius = np.minimum(self.size[:n].astype(np.int32), 7)
+        levels = self.ALPHA_LEVELS - 1
+        alpha = np.clip(self.life[:n] / self.fade[:n], 0, 1)
+        codes = (self.color[:n] * 8 + radius) * self.ALPHA_LEVELS + (alpha * levels).astype(np.int32)
+        visible = radius > 0
+        xs = (self.x[:n] - radius)[visible].astype(np.int32).tolist()
+        ys = (self.y[:n] - radius)[visible].astype(np.int32).tolist()
+
+        m = len(xs)
+        blits = self.blits
+        while len(blits) < m:
+            blits.append([None, pygame.Rect(0, 0, 0, 0)])
+
+        sprites = self.sprites
+        for item, code, x, y in zip(blits, codes[visible].tolist(), xs, ys):
+            sprite = sprites.get(code)
+            if sprite is None:
+                sprite = self._sprite(code)
+            item[0] = sprite
+            rect = item[1]
+            rect.x = x
+            rect.y = y
+        surface.blits(blits if m == len(blits) else islice(blits, m), doreturn=False)
+
+
+class Explosion:
+    """Взрыв: разовый выброс частиц в систему частиц"""
+
+    PARTICLES = 20
+    SPEED = 5  # пикселей за тик по каждой оси, как у исходного эффекта
+
+    def __init__(self, particles):
+        self.particles = particles
+        self.colors = [particles.color_index(c) for c in (YELLOW, ORANGE, RED)]
+
+    def emit(self, x, y, color=YELLOW, size=30, duration=500):
+        """Взрыв в точке (x, y); duration - время жизни в мс
+
+        size на разлёт не влияет: частицы, как в исходном эффекте, летят
+        со скоростью до SPEED по каждой оси при любом размере взрыва.
+        """
+        particles = self.particles
+        rng = particles.rng
+        n = self.PARTICLES
+        speed = self.SPEED
+        # Ни одна частица не живёт дольше duration
+        max_life = max(1, duration * particles.clock.tick_rate // 1000)
+        palette = np.array([particles.color_index(color)] + self.colors)
+        particles.emit(
+            x, y,
+            rng.uniform(-speed, speed, n),
+            rng.uniform(-speed, speed, n),
+            np.minimum(rng.integers(20, 41, n), max_life),
+            rng.integers(2, 6, n),
+            rng.choice(palette, n),
+            fade=40, shrink=0.1,
+        )
 
 
 class StarField:
-    """Звёздное поле (фон)"""
+    """Звёздное поле (фон) из заранее нарисованных слоёв с параллаксом
+
+    Каждый слой - поверхность размером с экран, которая прокручивается двумя blit.
+    Звёзды рисуются один раз в 8-битный слой; мерцание - цикл палитры: для каждой
+    фазы цикла слой с своей палитрой переводится в формат экрана (RLE) заранее,
+    и в кадре выбирается готовая поверхность. С bake=False слои только
+    рисуются, а перевод в формат экрана (convert) откладывается до bake() -
+    так поле можно построить в фоновом потоке.
+    """
     
-    def __init__(self, width, height, star_count=100, speed=2):
+    def __init__(self, width, height, star_count=100, speed=2, layers=3, phases=4, seed=None, bake=True):
         self.width = width
         self.height = height
         self.speed = speed
-        self.stars = []
-        
-        # Создание звёзд
-        for _ in range(star_count):
-            self.stars.append({
-                'x': random.randint(0, width),
-                'y': random.randint(0, height),
-                'size': random.randint(1, 3),
-                'speed': random.uniform(0.5, speed),
-                'brightness': random.randint(100, 255)
-            })
+        self.phases = phases
+        self.frame = 0
+        rng = random.Random(seed)
+
+        # Яркость и сдвиг мерцания для каждого индекса палитры (0 - прозрачный фон)
+        brightness = np.array([rng.randint(100, 255) for _ in range(255)])
+        shift = np.array([rng.uniform(0, 2 * math.pi) for _ in range(255)])
+
+        # Слои от дальнего (медленного) к ближнему (быстрому)
+        self.layers = []
+        self.unbaked = []  # (8-битный слой, палитры фаз) до bake()
+        for i in range(layers):
+            indexed = pygame.Surface((width, height), 0, 8)
+            indexed.fill(0)
+            for _ in range(star_count // layers):
+                x = rng.randint(0, width)
+                y = rng.randint(0, height)
+                size = rng.randint(1, 3)
+                index = rng.randint(1, 255)
+                # Копии у верхнего и нижнего края, чтобы слой стыковался сам с собой
+                for dy in (-height, 0, height):
+                    pygame.draw.circle(indexed, index, (x, y + dy), size)
+
+            palettes = []
+            for phase in range(phases):
+                flicker = brightness + 20 * np.sin(2 * math.pi * phase / phases + shift)
+                flicker = np.clip(flicker, 100, 255).astype(np.int32).tolist()
+                palettes.append([(0, 0, 0)] + [(b, b, b) for b in flicker])
+            self.unbaked.append((indexed, palettes))
+
+            layer_speed = 0.5 + (speed - 0.5) * i / max(1, layers - 1)
+            self.layers.append({'frames': [], 'speed': layer_speed, 'offset': 0.0})
+
+        if bake:
+            self.bake()
+
+    def bake(self):
+        """Перевод слоёв в формат экрана по фазам мерцания (только в главном потоке)"""
+        for layer, (indexed, palettes) in zip(self.layers, self.unbaked):
+            for palette in palettes:
+                indexed.set_palette(palette)
+                layer['frames'].append(self._bake(indexed))
+        self.unbaked = []
+
+    def _bake(self, indexed):
+        """Копия 8-битного слоя в формате экрана с прозрачным фоном"""
+        if pygame.display.get_surface() is not None:
+            surface = indexed.convert()
+        else:
+            surface = indexed.convert(32)
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surface
     
-    def update(self):
-        """Обновление звёздного поля"""
-        for star in self.stars:
-            star['y'] += star['speed']
-            # Если звезда ушла за экран, перемещаем её наверх
-            if star['y'] > self.height:
-                star['y'] = 0
-                star['x'] = random.randint(0, self.width)
+    def update(self, scale=1.0):
+        """Обновление звёздного поля (scale - множитель скорости прокрутки)"""
+        for layer in self.layers:
+            layer['offset'] = (layer['offset'] + layer['speed'] * scale) % self.height
+        self.frame += 1
     
     def draw(self, surface):
-        """Отрисовка звёздного поля"""
-        for star in self.stars:
-            # Мерцание звёзд
-            brightness = star['brightness'] + random.randint(-20, 20)
-            brightness = max(100, min(255, brightness))
-            color = (brightness, brightness, brightness)
-            pygame.draw.circle(surface, color, (star['x'], int(star['y'])), star['size'])
+        """Отрисовка звёздного поля: два blit на слой"""
+        # Фаза мерцания меняется раз в 4 кадра
+        phase = self.frame // 4 % self.phases
+        for layer in self.layers:
+            image = layer['frames'][phase]
+            y = int(layer['offset'])
+            surface.blit(image, (0, y))
+            surface.blit(image, (0, y - self.height))
 
 
 class Thruster:
-    """Эффект двигателя"""
+    """Эффект двигателя: каждый кадр выпускает частицу в систему частиц"""
     
-    def __init__(self, x, y):
+    def __init__(self, particles, x, y):
+        self.particles = particles
         self.x = x
         self.y = y
-        self.particles = []
-        self.max_particles = 10
+        # Оттенки пламени от оранжевого до жёлтого
+        self.colors = np.array([particles.color_index((255, g, 0)) for g in (100, 150, 200, 255)])
     
     def update(self):
-        """Обновление эффекта"""
-        # Добавление новой частицы
-        if len(self.particles) < self.max_particles:
-            self.particles.append({
-                'x': self.x + random.uniform(-3, 3),
-                'y': self.y,
-                'vy': random.uniform(2, 5),
-                'life': random.randint(10, 20),
-                'size': random.randint(3, 6)
-            })
-        
-        # Обновление частиц
-        for particle in self.particles[:]:
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['size'] = max(0, particle['size'] - 0.2)
-            
-            if particle['life'] <= 0 or particle['size'] <= 0:
-                self.particles.remove(particle)
-    
-    def draw(self, surface):
-        """Отрисовка эффекта"""
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / 20))
-            color = (255, random.randint(100, 255), 0, alpha)
-            pygame.draw.circle(surface, color, 
-                             (int(particle['x']), int(particle['y'])), 
-                             int(particle['size']))
+        """Выпуск новой частицы"""
+        particles = self.particles
+        rng = particles.rng
+        particles.emit(
+            self.x + rng.uniform(-3, 3), self.y,
+            0, rng.uniform(2, 5),
+            rng.integers(10, 21), rng.integers(3, 7),
+            rng.choice(self.colors),
+            fade=20, shrink=0.2,
+        )
 
 
 class ScorePopup:
-    """Всплывающие очки"""
+    """Всплывающие очки (берутся из ScorePopup.pool, живут в PopupManager)"""
     
-    def __init__(self, x, y, text, color=WHITE):
+    def __init__(self, x, y, frames, *, clock, duration=1000):
+        self.reset(x, y, frames, clock=clock, duration=duration)
+
+    def reset(self, x, y, frames, *, clock, duration=1000):
+        """Подготовка к повторному использованию"""
         self.x = x
         self.y = y
-        self.text = text
-        self.color = color
-        self.start_time = pygame.time.get_ticks()
-        self.duration = 1000
-        self.font = pygame.font.Font(None, 28)
+        self.frames = frames  # надпись с убывающей прозрачностью
+        self.clock = clock
+        self.duration = duration
+        self.start_time = clock.get_ticks()
     
     def update(self):
-        """Обновление"""
-        pass
+        """Обновление: False, когда время показа вышло"""
+        return self.clock.get_ticks() - self.start_time <= self.duration
     
     def draw(self, surface):
-        """Отрисовка"""
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - self.start_time
-        
-        if elapsed > self.duration:
-            return False
-        
+        """Отрисовка готового кадра затухания"""
+        progress = min(1.0, (self.clock.get_ticks() - self.start_time) / self.duration)
+        frames = self.frames
+        image = frames[min(len(frames) - 1, int(progress * len(frames)))]
+
         # Смещение вверх
-        offset = (elapsed / self.duration) * 30
-        alpha = max(0, 255 - int(255 * (elapsed / self.duration)))
-        
-        text_surface = self.font.render(self.text, True, self.color)
-        text_rect = text_surface.get_rect(center=(self.x, self.y - offset))
-        surface.blit(text_surface, text_rect)
-        
-        return True
+        offset = progress * 30
+        surface.blit(image, image.get_rect(center=(self.x, self.y - offset)))
+
+
+ScorePopup.pool = ObjectPool(ScorePopup)
+
+
+class PopupManager:
+    """Всплывающие очки игры
+
+    Время жизни считается по часам симуляции, одновременно живёт не больше
+    max_popups (лишние вытесняют самые старые). Кадры затухания каждой надписи
+    отрисовываются один раз и хранятся в ограниченном кэше.
+    """
+
+    FADE_STEPS = 16
+
+    def __init__(self, clock, max_popups=32, duration=1000, max_labels=64):
+        self.clock = clock
+        self.max_popups = max_popups
+        self.duration = duration
+        self.max_labels = max_labels
+        self.popups = deque()  # в порядке появления
+        self.fade_frames = {}  # (текст, цвет) -> кадры затухания
+
+    def __len__(self):
+        return len(self.popups)
+
+    def _frames(self, text, color):
+        """Кадры затухания надписи (из кэша или новые)"""
+        key = (text, tuple(color))
+        frames = self.fade_frames.get(key)
+        if frames is None:
+            base = texts.render(text, 28, color)
+            frames = []
+            for step in range(self.FADE_STEPS):
+                alpha = 255 - 255 * step // self.FADE_STEPS
+                frame = base.convert_alpha() if pygame.display.get_surface() else base.copy()
+                frame.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                frames.append(frame)
+            if len(self.fade_frames) >= self.max_labels:
+                # Вытесняется надпись, добавленная раньше всех
+                del self.fade_frames[next(iter(self.fade_frames))]
+            self.fade_frames[key] = frames
+        return frames
+
+    def spawn(self, x, y, text, color=WHITE):
+        """Новая всплывающая надпись"""
+        if len(self.popups) >= self.max_popups:
+            ScorePopup.pool.release(self.popups.popleft())
+        popup = ScorePopup.pool.acquire(x, y, self._frames(text, color),
+                                        clock=self.clock, duration=self.duration)
+        self.popups.append(popup)
+        return popup
+
+    def update(self):
+        """Удаление надписей, время показа которых вышло (они всегда в начале очереди)"""
+        popups = self.popups
+        while popups and not popups[0].update():
+            ScorePopup.pool.release(popups.popleft())
+
+    def clear(self):
+        """Удаление всех надписей"""
+        while self.popups:
+            ScorePopup.pool.release(self.popups.popleft())
+
+    def draw(self, surface):
+        """Отрисовка живых надписей"""
+        for popup in self.popups:
+            popup.draw(surface)
@@ -2,16 +2,25 @@
 Классы врагов
 """
 import pygame
-import random
 import math
 from settings import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, RED, GREEN,
+    SCREEN_WIDTH, WHITE, RED, GREEN,
     PURPLE, ORANGE, CYAN, GRAY
 )
+from collision import bounding_radius
+from image_cache import images
 
 
 class Enemy(pygame.sprite.Sprite):
-    """Базовый класс врага"""
+    """Базовый класс врага
+
+    Враги с паттерном из movement.KERNELS двигаются пакетом (MovementSystem):
+    начальные move_timer и start_x забирает MovementSystem.add, дальше
+    состояние движения хранится в её массивах, и update таких врагов не
+    вызывается. Подклассы со своим движением (босс) переопределяют update.
+    """
+
+    collision_shape = "mask"
 
     def __init__(self, x, y, health=50, speed=2, damage=10, score_value=100, color=RED):
         super().__init__()
@@ -21,21 +30,26 @@ class Enemy(pygame.sprite.Sprite):
         self.damage = damage
         self.score_value = score_value
         self.color = color
-        self.shoot_timer = 0
         self.shoot_delay = 2000  # мс между выстрелами
+        self.first_shot_delay = 250  # мс от появления до первого выстрела
+        self.timers = []  # таймеры врага в колесе игры, снимаются при kill
         self.start_x = x
         self.start_y = y
         self.move_pattern = "straight"
         self.move_timer = 0
+        self.movement = None  # MovementSystem, которая двигает врага
         self.is_boss = False
 
-        self.image = self.create_enemy_image()
+        # Изображение и маска общие для всех врагов одного цвета
+        key = ("enemy", color)
+        self.image = images.image(key, self.create_enemy_image)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
         
         # Маска для коллизий
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = images.mask(key, self.create_enemy_image)
+        self.radius = bounding_radius(self.rect)
 
     def create_enemy_image(self):
         """Создание изображения врага"""
@@ -55,47 +69,28 @@ class Enemy(pygame.sprite.Sprite):
 
         return surface
 
-    def update(self):
-        """Обновление позиции врага"""
-        self.move_timer += 1
-
-        if self.move_pattern == "straight":
-            self.rect.y += self.speed
-        elif self.move_pattern == "sine":
-            self.rect.y += self.speed
-            self.rect.x = self.start_x + math.sin(self.move_timer * 0.03) * 50
-        elif self.move_pattern == "zigzag":
-            self.rect.y += self.speed
-            if self.move_timer % 60 < 30:
-                self.rect.x += 1
-            else:
-                self.rect.x -= 1
-        elif self.move_pattern == "circle":
-            self.rect.y += self.speed * 0.7
-            self.rect.x = self.start_x + math.cos(self.move_timer * 0.02) * 30
-
-        # Телепортация по X
-        if self.rect.right < 0:
-            self.rect.left = SCREEN_WIDTH
-            self.start_x = SCREEN_WIDTH + self.rect.width // 2
-        elif self.rect.left > SCREEN_WIDTH:
-            self.rect.right = 0
-            self.start_x = -self.rect.width // 2
-
-        # Удаление если ушёл слишком далеко вниз - ВРАГ УБИРАЕТСЯ БЕЗ ОЧКОВ
-        if self.rect.top > SCREEN_HEIGHT + 50:
-            self.kill()
-
-    def shoot(self):
-        """Выстрел врага"""
-        from bullets import EnemyBullet
-        current_time = pygame.time.get_ticks()
-        if current_time - self.shoot_timer > self.shoot_delay:
-            self.shoot_timer = current_time
-            # Пуля с фиксированной скоростью 5
-            bullet = EnemyBullet(self.rect.centerx, self.rect.bottom, speed=5)
-            return bullet
-        return None
+    def kill(self):
+        """Удаление из групп и отмена таймеров; MovementSystem уберёт врага на следующем шаге"""
+        super().kill()
+        if self.movement is not None:
+            self.movement.dirty = True
+        for timer in self.timers:
+            timer.cancel()
+
+    def start_timers(self, game):
+        """Завести таймеры врага в колесе игры: стрельба каждые shoot_delay мс"""
+        clock = game.clock
+        self.timers.append(game.timers.every(clock.ms_to_ticks(self.shoot_delay), self.fire, game,
+                                             delay=clock.ms_to_ticks(self.first_shot_delay)))
+
+    def fire(self, game):
+        """Выстрел по таймеру"""
+        self.shoot(game.clock.get_ticks(), game.enemy_bullets)
+
+    def shoot(self, current_time, bullets):
+        """Выстрел врага в поле пуль bullets (current_time - время симуляции в мс)"""
+        # Пуля с фиксированной скоростью 5
+        bullets.fire(self.rect.centerx, self.rect.bottom, speed=5)
 
     def take_damage(self, damage):
         """Получение урона"""
@@ -176,11 +171,12 @@ class TankEnemy(Enemy):
         self.shoot_delay = 1500
         self.level = level
 
-        self.image = self.create_tank_image()
+        self.image = images.image(("tank",), self.create_tank_image)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = images.mask(("tank",), self.create_tank_image)
+        self.radius = bounding_radius(self.rect)
 
     def create_tank_image(self):
         """Создание изображения танка"""
@@ -207,27 +203,17 @@ class ShooterEnemy(Enemy):
         damage = 10 + (level - 1) * 4
         score = 180 * level
 
-        super().__init__(x, y, health=health, speed=speed, damage=damage, score_value=score, color=CYN)
+        super().__init__(x, y, health=health, speed=speed, damage=damage, score_value=score, color=CYAN)
         self.move_pattern = "circle"
         self.shoot_delay = 1000
         self.level = level
-        
-        # Маска для коллизий
-        self.mask = pygame.mask.from_surface(self.image)
 
-    def shoot(self):
+    def shoot(self, current_time, bullets):
         """Стреляет тремя пулями"""
-        from bullets import EnemyBullet
-        current_time = pygame.time.get_ticks()
-        if current_time - self.shoot_timer > self.shoot_delay:
-            self.shoot_timer = current_time
-            bullets = []
-            # Пули с фиксированной скоростью
-            bullets.append(EnemyBullet(self.rect.centerx, self.rect.bottom, speed=5))
-            bullets.append(EnemyBullet(self.rect.centerx, self.rect.bottom, speed=5, angle=math.pi/6))
-            bullets.append(EnemyBullet(self.rect.centerx, self.rect.bottom, speed=5, angle=-math.pi/6))
-            return bullets
-        return None
+        # Пули с фиксированной скоростью
+        bullets.fire(self.rect.centerx, self.rect.bottom, speed=5)
+        bullets.fire(self.rect.centerx, self.rect.bottom, speed=5, angle=math.pi/6)
+        bullets.fire(self.rect.centerx, self.rect.bottom, speed=5, angle=-math.pi/6)
 
 
 class BossEnemy(Enemy):
@@ -245,17 +231,18 @@ class BossEnemy(Enemy):
         self.move_pattern = "boss_horizontal"  # Новый паттерн для босса
         self.shoot_delay = 800
         self.attack_pattern = 0
-        self.attack_timer = 0
+        self.attack_delay = 2500  # мс между сменами паттерна атаки
         self.move_direction = 1  # 1 вправо, -1 влево
         self.move_range = 200  # Диапазон движения по горизонтали
         self.base_x = SCREEN_WIDTH // 2
         self.base_y = 100  # Фиксированная позиция по Y
 
-        self.image = self.create_boss_image()
+        self.image = images.image(("boss",), self.create_boss_image)
         self.rect = self.image.get_rect()
         self.rect.centerx = x
         self.rect.centery = y
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = images.mask(("boss",), self.create_boss_image)
+        self.radius = bounding_radius(self.rect)
 
     def create_boss_image(self):
         """Создание изображения босса"""
@@ -299,11 +286,14 @@ class BossEnemy(Enemy):
             self.rect.right = SCREEN_WIDTH
             self.move_direction = -1
 
-        # Изменение паттерна атаки
-        self.attack_timer += 1
-        if self.attack_timer > 300:
-            self.attack_timer = 0
-            self.attack_pattern = (self.attack_pattern + 1) % 3
+    def start_timers(self, game):
+        """Кроме стрельбы - смена паттерна атаки каждые attack_delay мс"""
+        super().start_timers(game)
+        self.timers.append(game.timers.every(game.clock.ms_to_ticks(self.attack_delay), self.next_attack))
+
+    def next_attack(self):
+        """Следующий паттерн атаки"""
+        self.attack_pattern = (self.attack_pattern + 1) % 3
 
     def draw(self, surface):
         """Отрисовка босса с полоской здоровья"""
@@ -324,33 +314,22 @@ class BossEnemy(Enemy):
         # Рамка
         pygame.draw.rect(surface, WHITE, (self.rect.centerx - bar_width//2, self.rect.top - 15, bar_width, bar_height), 2)
 
-    def shoot(self):
+    def shoot(self, current_time, bullets):
         """Особая атака босса"""
-        from bullets import EnemyBullet
-        current_time = pygame.time.get_ticks()
-        if current_time - self.shoot_timer > self.shoot_delay:
-            self.shoot_timer = current_time
-            bullets = []
-
-            if self.attack_pattern == 0:
-                # Круговой выстрел
-                for i in range(8):
-                    angle = (2 * math.pi / 8) * i
-                    bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                        speed=4, angle=angle + math.pi/2)
-                    bullets.append(bullet)
-            elif self.attack_pattern == 1:
-                # Тройной выстрел вниз
-                bullets.append(EnemyBullet(self.rect.centerx - 20, self.rect.bottom, speed=5))
-                bullets.append(EnemyBullet(self.rect.centerx, self.rect.bottom, speed=5))
-                bullets.append(EnemyBullet(self.rect.centerx + 20, self.rect.bottom, speed=5))
-            else:
-                # Спиральный выстрел
-                angle = current_time * 0.01
-                for i in range(4):
-                    bullet = EnemyBullet(self.rect.centerx, self.rect.centery,
-                                        speed=4, angle=angle + (math.pi/2) * i)
-                    bullets.append(bullet)
-
-            return bullets
-        return None
+        if self.attack_pattern == 0:
+            # Круговой выстрел
+            for i in range(8):
+                angle = (2 * math.pi / 8) * i
+                bullets.fire(self.rect.centerx, self.rect.centery,
+                             speed=4, angle=angle + math.pi/2)
+        elif self.attack_pattern == 1:
+            # Тройной выстрел вниз
+            bullets.fire(self.rect.centerx - 20, self.rect.bottom, speed=5)
+            bullets.fire(self.rect.centerx, self.rect.bottom, speed=5)
+            bullets.fire(self.rect.centerx + 20, self.rect.bottom, speed=5)
+        else:
+            # Спиральный выстрел
+            angle = current_time * 0.01
+            for i in range(4):
+                bullets.fire(self.rect.centerx, self.rect.centery,
+                             speed=4, angle=angle + (math.pi/2) * i)
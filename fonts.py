@@ -0,0 +1,59 @@
+"""
+Реестр шрифтов и кэш отрисованного текста
+"""
+from collections import OrderedDict
+import pygame
+
+
+class TextCache:
+    """Шрифты создаются один раз на (имя, размер), готовые надписи хранятся в LRU-кэше
+
+    Ключ надписи - (шрифт, текст, цвет, сглаживание). Когда кэш заполнен,
+    вытесняется надпись, которую дольше всех не запрашивали.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, size, name=None):
+        """Шрифт из реестра (name=None - шрифт pygame по умолчанию)"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, name=None):
+        """Надпись из кэша; отрисовывается только при промахе"""
+        key = (name, size, text, tuple(color), antialias)
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = surfaces[key] = self.font(size, name).render(text, antialias, color)
+        if len(surfaces) > self.max_size:
+            surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        """Счётчики кэша"""
+        return {
+            "size": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Общий для всего процесса кэш
+texts = TextCache()
@@ -2,25 +2,49 @@
 Основной класс игры
 """
 import pygame
+import random
 from settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, WHITE,
-    DARK_BLUE, TOTAL_LEVELS
+    DARK_BLUE
 )
 from player import Player
+from bullets import BulletField, PlayerBulletField
 from collision import CollisionSystem, Score
-from effects import StarField, ScorePopup
+from effects import PopupManager, ParticleSystem, Explosion
+from simclock import SimClock
+from timers import TimerWheel
+from movement import MovementSystem
+from fonts import texts
+from levels.engine import WaveLevel, EndlessLevel, specs
 
 
 class Game:
     """Основной класс игры"""
 
-    def __init__(self, space_shooter, level=1):
+    def __init__(self, space_shooter, level=1, seed=None):
         self.space_shooter = space_shooter
-        self.sound_manager = space_shooter.sound_manager
+        self.profiler = space_shooter.profiler
+
+        # Часы и генератор случайных чисел симуляции: один seed - один и тот же прогон
+        self.clock = SimClock()
+        # Таймеры событий (выстрелы, неуязвимость, атаки босса, спавн) идут по тикам часов
+        self.timers = TimerWheel()
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
-        self.player_bullets = pygame.sprite.Group()
-        self.enemy_bullets = pygame.sprite.Group()
+        # Враги без ядра движения (босс): их двигает собственный update
+        self.self_moving = pygame.sprite.Group()
+        # Пули игрока летят по формуле от точки запуска, как и пули врагов
+        self.player_bullets = PlayerBulletField()
+        self.enemy_bullets = BulletField()
+        # Движение врагов пакетами по паттернам
+        self.movement = MovementSystem()
+
+        # Частицы (взрывы) - отдельный генератор, чтобы эффекты не сдвигали случайность уровня
+        self.particles = ParticleSystem(self.clock, seed=self.seed)
+        self.explosions = Explosion(self.particles)
 
         # Создание игрока
         self.player = Player(self)
@@ -30,37 +54,52 @@ class Game:
         self.collision_system = CollisionSystem(self)
 
         # Счёт
-        self.score = Score()
+        self.score = Score(space_shooter.highscores, space_shooter.leaderboard)
+        self.kills = 0
 
-        # Звёздный фон
-        self.star_field = StarField(SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Звёздный фон (общий с меню и финальными экранами)
+        self.star_field = space_shooter.star_field
 
         # Уровень
+        self.start_level = level
         self.current_level_num = level
         self.level = None
         self.level_completed = False
         self.load_level()
 
         # Всплывающие очки
-        self.score_popups = []
-
-        # Таймер для вражеских выстрелов
-        self.enemy_shoot_timer = 0
+        self.popups = PopupManager(self.clock)
 
         # Клавиши
-        self.keys = pygame.key.get_pressed()
+        self.keys = space_shooter.get_keys()
 
     def load_level(self):
-        """Загрузка уровня"""
-        if self.current_level_num == 1:
-            from levels.level_1 import Level1
-            self.level = Level1(self)
-        elif self.current_level_num == 2:
-            from levels.level_2 import Level2
-            self.level = Level2(self)
-        elif self.current_level_num == 3:
-            from levels.level_3 import Level3
-            self.level = Level3(self)
+        """Загрузка уровня по его описанию (описание с волнами - бесконечный режим)"""
+        spec = specs.get(self.current_level_num)
+        if spec is None:
+            self.level = None
+        elif spec.waves:
+            self.level = EndlessLevel(self, spec)
+        else:
+            self.level = WaveLevel(self, spec)
+
+    @property
+    def sound_manager(self):
+        """Звуки приложения (None, пока AssetLoader их не загрузил)"""
+        return self.space_shooter.sound_manager
+
+    def add_enemy(self, enemy):
+        """Добавить врага в игру"""
+        self.all_sprites.add(enemy)
+        self.enemies.add(enemy)
+        if not self.movement.add(enemy):
+            self.self_moving.add(enemy)
+        enemy.start_timers(self)
+
+    def close(self):
+        """Конец игры: живые пули и надписи возвращаются в общие пулы"""
+        self.player_bullets.clear()
+        self.popups.clear()
 
     def handle_event(self, event):
         """Обработка событий"""
@@ -70,21 +109,30 @@ class Game:
 
     def update(self):
         """Обновление игры"""
+        profiler = self.profiler
+        self.clock.advance()
+
         # Обновление клавиш
-        self.keys = pygame.key.get_pressed()
+        self.keys = self.space_shooter.get_keys()
+        profiler.mark("input")
 
         # Обновление звёздного фона
         self.star_field.update()
+        profiler.mark("stars")
 
         # Обновление игрока
         self.player.update()
+        profiler.mark("player")
 
-        # Обновление пуль
+        # Обновление пуль: только шаг и удаление вылетевших за экран
         self.player_bullets.update()
         self.enemy_bullets.update()
+        profiler.mark("bullets")
 
-        # Обновление врагов
-        self.enemies.update()
+        # Обновление врагов: паттерны с ядром - пакетом, босс - своим update
+        self.movement.step()
+        self.self_moving.update()
+        profiler.mark("enemies")
 
         # Обновление уровня
         if self.level:
@@ -93,36 +141,36 @@ class Game:
             # Проверка завершения уровня
             if self.level.is_completed():
                 self.level_completed = True
-                if self.current_level_num < TOTAL_LEVELS:
+                self.score.flush()
+                if self.current_level_num < len(specs):
                     self.current_level_num += 1
                     self.load_level()
                 else:
                     # Все уровни пройдены
                     self.space_shooter.state = "victory"
+        profiler.mark("level")
 
-        # Враги стреляют
-        self.enemy_shoot_timer += 1
-        if self.enemy_shoot_timer > 30:  # Каждые 30 кадров
-            self.enemy_shoot_timer = 0
-            for enemy in self.enemies:
-                bullets = enemy.shoot()
-                if bullets:
-                    if isinstance(bullets, list):
-                        for bullet in bullets:
-                            self.all_sprites.add(bullet)
-                            self.enemy_bullets.add(bullet)
-                    else:
-                        self.all_sprites.add(bullets)
-                        self.enemy_bullets.add(bullets)
+        # Сработавшие таймеры: выстрелы врагов, конец неуязвимости, атаки босса, спавн
+        self.timers.advance(self.clock.ticks)
+        profiler.mark("timers")
 
         # Проверка столкновений
         self.collision_system.check_collisions()
+        profiler.mark("collisions")
 
-        # Обновление всех спрайтов
-        self.all_sprites.update()
+        # Второй шаг спрайтов: игрок, враги и пули двигаются за кадр дважды.
+        # all_sprites - это игрок и враги, поэтому update вызывается только у тех,
+        # кого не ведёт MovementSystem
+        self.movement.step()
+        self.player.update()
+        self.self_moving.update()
+        self.player_bullets.update()
+        self.enemy_bullets.update()
+        self.particles.update()
 
-        # Обновление всплывающих очков
-        self.score_popups = [p for p in self.score_popups if p.update() != False]
+        # Всплывающие очки: истёкшие возвращаются в пул
+        self.popups.update()
+        profiler.mark("effects")
 
     def draw(self, surface):
         """Отрисовка игры"""
@@ -136,10 +184,12 @@ class Game:
                 sprite.draw(surface)
             else:
                 surface.blit(sprite.image, sprite.rect)
+        self.player_bullets.draw(surface)
+        self.enemy_bullets.draw(surface)
+        self.particles.draw(surface)
 
         # Отрисовка всплывающих очков
-        for popup in self.score_popups:
-            popup.draw(surface)
+        self.popups.draw(surface)
 
         # Интерфейс
         self.draw_ui(surface)
@@ -153,8 +203,7 @@ class Game:
         self.score.draw(surface, SCREEN_WIDTH - 10, 10)
 
         # Информация об уровне
-        level_font = pygame.font.Font(None, 28)
-        level_text = level_font.render(f"Level {self.current_level_num}: {self.level.name}", True, WHITE)
+        level_text = texts.render(self.level.title, 28, WHITE)
         surface.blit(level_text, (SCREEN_WIDTH // 2 - level_text.get_width() // 2, 10))
 
         # Прогресс уровня
@@ -174,15 +223,11 @@ class Game:
             # Счётчик убитых врагов
             if hasattr(self.level, 'enemies_killed') and hasattr(self.level, 'enemies_to_kill'):
                 if not self.level.boss_spawned:
-                    counter_text = level_font.render(
+                    counter_text = texts.render(
                         f"Killed: {self.level.enemies_killed}/{self.level.enemies_to_kill}",
-                        True, WHITE
+                        28, WHITE
                     )
                     surface.blit(counter_text, (SCREEN_WIDTH // 2 - counter_text.get_width() // 2, 55))
                 else:
-                    boss_text = level_font.render("BOSS FIGHT!", True, RED := (255, 0, 0))
+                    boss_text = texts.render("BOSS FIGHT!", 28, RED := (255, 0, 0))
                     surface.blit(boss_text, (SCREEN_WIDTH // 2 - boss_text.get_width() // 2, 55))
-
-        # Отладка - количество врагов на экране
-        debug_text = pygame.font.Font(None, 24).render(f"Enemies on screen: {len(self.enemies)}", True, (150, 150, 150))
-        surface.blit(debug_text, (10, SCREEN_HEIGHT - 30))
@@ -0,0 +1,163 @@
+"""
+Безголовый режим - симуляция игры без окна и без ограничения FPS
+
+Запуск:
+    python headless.py --level 1 --frames 10000
+    python headless.py --level endless --immortal --draw --frames 60000
+"""
+import os
+
+# Драйверы-заглушки должны быть выбраны до инициализации pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import hashlib
+import time
+import pygame
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from game import Game
+from profiler import FrameProfiler
+from effects import StarField
+from levels.engine import ENDLESS_LEVEL, EndlessLevel
+
+
+class ScriptedKeys:
+    """Состояние клавиатуры, задаваемое программно"""
+
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def press(self, key):
+        """Зажать клавишу"""
+        self.pressed.add(key)
+
+    def release(self, key):
+        """Отпустить клавишу"""
+        self.pressed.discard(key)
+
+
+class HeadlessShooter:
+    """Замена SpaceShooter: без окна, звука и clock.tick(FPS)"""
+
+    def __init__(self, autofire=True, immortal=False):
+        pygame.init()
+        # С драйвером dummy окно не создаётся, но поверхность нужна для draw
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.running = True
+        self.state = "game"
+        self.sound_manager = None
+        # Рекорд не читается и не пишется: прогоны не зависят от highscore.txt
+        self.highscores = None
+        self.leaderboard = None
+        self.profiler = FrameProfiler()
+        self.star_field = StarField(SCREEN_WIDTH, SCREEN_HEIGHT, star_count=150)
+        self.keys = ScriptedKeys()
+        self.autofire = autofire
+        # Бессмертный игрок: прогон бесконечного режима не обрывается смертью
+        self.immortal = immortal
+        self.game = None
+        self.frames = 0
+
+    def get_keys(self):
+        """Состояние клавиатуры для игрока"""
+        return self.keys
+
+    def new_game(self, level=1, seed=None):
+        """Создать новую игру (прежняя возвращает объекты в пулы)"""
+        if self.game:
+            self.game.close()
+        self.game = Game(self, level, seed=seed)
+        self.state = "game"
+        self.frames = 0
+        return self.game
+
+    def step(self, draw=False):
+        """Один кадр симуляции"""
+        self.profiler.begin_frame()
+        if self.autofire:
+            self.game.player.shoot()
+
+        self.game.update()
+        if self.immortal:
+            self.game.player.health = self.game.player.max_health
+        if draw:
+            self.game.draw(self.screen)
+            self.profiler.mark("draw")
+        self.profiler.end_frame()
+        self.frames += 1
+
+        # Та же проверка окончания игры, что и в SpaceShooter.update
+        if self.game.player.health <= 0:
+            self.state = "game_over"
+        elif self.game.level_completed:
+            self.state = "victory"
+
+    def run(self, frames, draw=False, stop_on_end=True):
+        """Прогнать заданное число кадров так быстро, как позволяет CPU"""
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step(draw)
+            if stop_on_end and self.state != "game":
+                break
+        elapsed = time.perf_counter() - start
+
+        return {
+            "frames": self.frames,
+            "seconds": elapsed,
+            "fps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "state": self.state,
+            "digest": state_digest(self.game),
+        }
+
+
+def state_digest(game):
+    """Отпечаток игрового состояния: одинаковый seed - одинаковый отпечаток"""
+    state = (
+        game.clock.ticks,
+        game.score.score,
+        game.player.health,
+        tuple(game.player.rect),
+        tuple(sorted((type(e).__name__, e.health, tuple(e.rect)) for e in game.enemies)),
+        tuple(sorted(game.player_bullets.rects())),
+        tuple(sorted(game.enemy_bullets.positions())),
+    )
+    return hashlib.sha1(repr(state).encode()).hexdigest()[:16]
+
+
+def level_number(value):
+    """Номер уровня из командной строки: число или endless"""
+    return ENDLESS_LEVEL if value == "endless" else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Безголовая симуляция Space Shooter")
+    parser.add_argument("--level", type=level_number, default=1, help="номер уровня или endless")
+    parser.add_argument("--frames", type=int, default=10000, help="сколько кадров симулировать")
+    parser.add_argument("--seed", type=int, default=None, help="seed симуляции")
+    parser.add_argument("--draw", action="store_true", help="вызывать Game.draw каждый кадр")
+    parser.add_argument("--no-autofire", action="store_true", help="не стрелять автоматически")
+    parser.add_argument("--keep-going", action="store_true",
+                        help="не останавливаться на победе или поражении")
+    parser.add_argument("--immortal", action="store_true", help="игрок не теряет здоровье")
+    args = parser.parse_args()
+
+    shooter = HeadlessShooter(autofire=not args.no_autofire, immortal=args.immortal)
+    shooter.new_game(args.level, seed=args.seed)
+    result = shooter.run(args.frames, draw=args.draw, stop_on_end=not args.keep_going)
+
+    print(f"Кадров: {result['frames']}, время: {result['seconds']:.3f} с, "
+          f"{result['fps']:.0f} кадров/с, состояние: {result['state']}, "
+          f"seed: {shooter.game.seed}, отпечаток: {result['digest']}")
+
+    level = shooter.game.level
+    if isinstance(level, EndlessLevel):
+        breaks = "; ".join(f"{budget} мс - волна {record['wave']}" for budget, record in level.budget_breaks.items())
+        print(f"Волна: {level.wave}, превышения бюджета кадра: {breaks or 'нет'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Хранение рекорда с отложенной записью на диск
+"""
+import os
+import tempfile
+import threading
+
+# Файл рекорда лежит рядом с модулями игры, а не в текущем каталоге
+HIGHSCORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "highscore.txt")
+
+
+class HighScoreStore:
+    """Рекорд в памяти, запись на диск - из фонового потока
+
+    Обновления в кадре только меняют число в памяти; поток записывает последнее
+    значение раз в flush_interval секунд или сразу после flush_soon().
+    Файл заменяется атомарно (временный файл + os.replace), поэтому падение
+    посреди записи не портит старый рекорд.
+    """
+
+    def __init__(self, path=HIGHSCORE_PATH, flush_interval=5.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.value = self.load()
+        self.saved = self.value
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="highscore-writer", daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Чтение рекорда с диска"""
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def submit(self, score):
+        """Новый результат: запоминается, если это рекорд (без обращения к диску)"""
+        if score > self.value:
+            self.value = score
+
+    def flush_soon(self):
+        """Попросить фоновый поток записать рекорд сейчас (конец уровня, конец игры)"""
+        self._wake.set()
+
+    def flush(self):
+        """Синхронная запись рекорда, если он изменился"""
+        with self._lock:
+            value = self.value
+            if value == self.saved:
+                return
+            directory = os.path.dirname(self.path) or "."
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".highscore-", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        f.write(str(value))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+                except OSError:
+                    os.unlink(tmp_path)
+                    raise
+            except OSError:
+                return
+            self.saved = value
+
+    def close(self):
+        """Остановка потока и последняя запись (при выходе из игры)"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        """Фоновый поток: запись по таймеру или по запросу"""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
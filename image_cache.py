@@ -0,0 +1,48 @@
+"""
+Общий кэш заранее отрисованных изображений спрайтов и их масок
+"""
+import pygame
+
+
+class ImageCache:
+    """Кэш изображений по ключу (вид спрайта и параметры: направление, цвет, размер...)
+
+    Каждое изображение и маска строятся один раз; все спрайты одного вида
+    получают ссылку на одну и ту же поверхность. Изображения переводятся в формат
+    экрана (convert_alpha), если окно уже создано.
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.masks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, key, builder):
+        """Изображение по ключу; builder() вызывается только при первом запросе"""
+        image = self.images.get(key)
+        if image is None:
+            self.misses += 1
+            image = builder()
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            self.images[key] = image
+        else:
+            self.hits += 1
+        return image
+
+    def mask(self, key, builder):
+        """Маска изображения по тому же ключу"""
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = self.masks[key] = pygame.mask.from_surface(self.image(key, builder))
+        return mask
+
+    def clear(self):
+        """Очистка кэша (например, после смены режима экрана)"""
+        self.images.clear()
+        self.masks.clear()
+
+
+# Общий для всего процесса кэш
+images = ImageCache()
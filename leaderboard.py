@@ -0,0 +1,133 @@
+"""
+Таблица результатов (SQLite): каждый забег с уровнем, очками, длительностью, убийствами и seed
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# База лежит рядом с модулями игры, а не в текущем каталоге
+LEADERBOARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leaderboard.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    level INTEGER NOT NULL,
+    reached INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    kills INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_level_score ON runs (level, score DESC);
+"""
+
+
+class Leaderboard:
+    """Таблица результатов: запись из фонового потока, чтение через кэш
+
+    Забеги ставятся в очередь и записываются отдельным потоком со своим
+    соединением. Запросы топа идут по индексам (по уровню и общий) и
+    кэшируются в ограниченном LRU-кэше; кэш сбрасывается после каждой записи.
+    """
+
+    def __init__(self, path=LEADERBOARD_PATH, cache_size=32):
+        self.path = path
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (level, limit) -> (версия, строки)
+        self.version = 0            # растёт после каждой записи в базу
+        self.db = sqlite3.connect(path)
+        try:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            self.db.commit()
+        except sqlite3.Error:
+            self.db.close()
+            raise
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, path=LEADERBOARD_PATH):
+        """Открыть таблицу; при ошибке SQLite - None (игра идёт без таблицы результатов)"""
+        try:
+            return cls(path)
+        except sqlite3.Error as e:
+            print(f"Таблица результатов недоступна: {e}")
+            return None
+
+    def record(self, level, reached, score, duration_ms, kills, seed):
+        """Поставить забег в очередь на запись (без обращения к диску)"""
+        self._queue.put((level, reached, score, duration_ms, kills, seed, time.time()))
+
+    def top(self, limit=10, level=None):
+        """Лучшие забеги: списком словарей, по уровню или по всем уровням"""
+        key = (level, limit)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            self.cache.move_to_end(key)
+            return cached[1]
+
+        version = self.version
+        columns = "level, reached, score, duration_ms, kills, seed"
+        if level is None:
+            rows = self.db.execute(
+                f"SELECT {columns} FROM runs ORDER BY score DESC LIMIT ?", (limit,)
+            ).fetchall()
+        else:
+            rows = self.db.execute(
+                f"SELECT {columns} FROM runs WHERE level = ? ORDER BY score DESC LIMIT ?", (level, limit)
+            ).fetchall()
+        names = columns.split(", ")
+        result = [dict(zip(names, row)) for row in rows]
+
+        self.cache[key] = (version, result)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def best(self, level=None):
+        """Лучший счёт (0, если забегов нет)"""
+        top = self.top(1, level)
+        return top[0]["score"] if top else 0
+
+    def close(self):
+        """Дописать очередь и остановить поток (при выходе из игры)"""
+        self._queue.put(None)
+        self._thread.join()
+        self.db.close()
+
+    def _run(self):
+        """Фоновый поток: запись забегов пачками"""
+        db = sqlite3.connect(self.path)
+        while True:
+            item = self._queue.get()
+            batch = []
+            # Всё, что успело накопиться, пишется одной транзакцией
+            while item is not None:
+                batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with db:
+                        db.executemany(
+                            "INSERT INTO runs (level, reached, score, duration_ms, kills, seed, finished_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", batch
+                        )
+                except sqlite3.Error:
+                    pass
+                else:
+                    self.version += 1
+            if item is None:
+                break
+        db.close()
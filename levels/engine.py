@@ -0,0 +1,370 @@
+"""
+Движок уровней: описания уровней в JSON и заранее собранное расписание спавна
+"""
+import bisect
+import glob
+import json
+import os
+import re
+import threading
+from collections import deque
+import pygame
+import enemies
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Описания уровней лежат рядом с модулем: levels/level_<номер>.json
+LEVELS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Номер бесконечного режима (levels/endless.json)
+ENDLESS_LEVEL = 0
+
+
+class LevelSpec:
+    """Описание уровня из файла level_<номер>.json
+
+    Поля файла:
+        name, description         - название и строка для меню
+        enemies_to_kill           - сколько убить до босса
+        max_enemies_on_screen     - предел врагов на экране
+        spawn_delay               - мс между спавнами: число или [начало, конец]
+                                    (задержка линейно меняется до появления босса)
+        enemies                   - смесь врагов: [{"type": "BasicEnemy", "weight": 0.7}, ...]
+        boss                      - {"type": "BossEnemy", "x": ..., "y": 80} (x по умолчанию - центр)
+        enemy_level               - параметр level врагов (по умолчанию номер уровня)
+        spawn_margin, spawn_y     - отступ от краёв по X и высота появления врагов
+        waves                     - шаги роста по волнам (только бесконечный режим)
+    """
+
+    def __init__(self, number, data):
+        self.number = number
+        self.name = data["name"]
+        self.description = data.get("description", "")
+        self.enemies_to_kill = data["enemies_to_kill"]
+        self.max_enemies_on_screen = data["max_enemies_on_screen"]
+        delay = data["spawn_delay"]
+        self.spawn_delay = tuple(delay) if isinstance(delay, list) else (delay, delay)
+        self.enemy_level = data.get("enemy_level", number)
+        self.spawn_margin = data.get("spawn_margin", 80)
+        self.spawn_y = data.get("spawn_y", -50)
+        self.waves = data.get("waves")
+
+        # Смесь врагов: классы и накопленные веса для выбора по одному random()
+        self.enemy_types = []
+        self.weights = []
+        total = 0
+        for entry in data["enemies"]:
+            self.enemy_types.append(self.enemy_class(entry["type"]))
+            total += entry.get("weight", 1)
+            self.weights.append(total)
+
+        boss = data["boss"]
+        self.boss_type = self.enemy_class(boss["type"])
+        self.boss_pos = (boss.get("x", SCREEN_WIDTH // 2), boss.get("y", 80))
+
+    @staticmethod
+    def enemy_class(name):
+        """Класс врага по имени из enemies.py"""
+        enemy_class = getattr(enemies, name, None)
+        if not (isinstance(enemy_class, type) and issubclass(enemy_class, enemies.Enemy)):
+            raise ValueError(f"Неизвестный тип врага: {name}")
+        return enemy_class
+
+    @classmethod
+    def from_file(cls, number, path):
+        """Чтение описания из JSON-файла"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        try:
+            return cls(number, data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{os.path.basename(path)}: ошибка в описании уровня ({e!r})") from e
+
+
+class LevelSpecs:
+    """Все описания уровней, номера идут подряд с 1; бесконечный режим - отдельно
+
+    Файлы читаются один раз (в фоне загрузчиком или при первом обращении).
+    """
+
+    def __init__(self, directory=LEVELS_DIR):
+        self.directory = directory
+        self.specs = None
+        self.endless = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Чтение level_*.json (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self.specs is None:
+                found = {}
+                for path in glob.glob(os.path.join(self.directory, "level_*.json")):
+                    match = re.fullmatch(r"level_(\d+)\.json", os.path.basename(path))
+                    if match:
+                        number = int(match.group(1))
+                        found[number] = LevelSpec.from_file(number, path)
+                # Уровни идут подряд: пропуск номера обрывает список
+                specs = []
+                while len(specs) + 1 in found:
+                    specs.append(found[len(specs) + 1])
+                endless = os.path.join(self.directory, "endless.json")
+                if os.path.exists(endless):
+                    self.endless = LevelSpec.from_file(ENDLESS_LEVEL, endless)
+                self.specs = specs
+        return self.specs
+
+    def get(self, number):
+        """Описание уровня по номеру (None, если такого нет)"""
+        specs = self.load()
+        if number == ENDLESS_LEVEL:
+            return self.endless
+        return specs[number - 1] if 1 <= number <= len(specs) else None
+
+    def __len__(self):
+        return len(self.load())
+
+    def __iter__(self):
+        return iter(self.load())
+
+
+# Общий список уровней для игры и меню
+specs = LevelSpecs()
+
+
+class WaveLevel:
+    """Уровень по описанию: враги выходят по расписанию, собранному при загрузке
+
+    Расписание - список (задержка, x, класс врага); случайность (позиции и
+    смесь врагов) разыгрывается в compile() блоком из enemies_to_kill +
+    max_enemies_on_screen спавнов. Задержку отсчитывает таймер в колесе игры;
+    если к её концу экран полон, спавн ждёт первого свободного места. Если
+    враги улетают за экран и блок кончается раньше босса, расписание
+    дописывается следующим блоком.
+    """
+
+    def __init__(self, game, spec):
+        self.game = game
+        self.spec = spec
+        self.level_number = spec.number
+        self.name = spec.name
+        self.title = f"Level {spec.number}: {spec.name}"
+        self.enemies_to_kill = spec.enemies_to_kill
+        self.enemies_killed = 0
+        self.spawn_timer = None  # таймер следующего спавна в колесе игры
+        self.spawn_ready = False  # задержка вышла, но экран был полон
+        self.boss_spawned = False
+        self.boss_defeated = False
+        self.max_enemies_on_screen = spec.max_enemies_on_screen
+        self.enemy_level = spec.enemy_level
+        self.delays = None
+        self.timeline = []
+        self.next_spawn = 0
+        self.compile()
+
+    def compile(self, spawn_delay=None):
+        """Сборка расписания спавна (spawn_delay - одна задержка вместо кривой из описания)"""
+        self.delays = self.spec.spawn_delay if spawn_delay is None else (spawn_delay, spawn_delay)
+        self.timeline = []
+        self.next_spawn = 0
+        self._extend()
+        self._schedule_spawn()
+
+    def _extend(self):
+        """Ещё один блок расписания: enemies_to_kill + max_enemies_on_screen спавнов"""
+        spec = self.spec
+        rng = self.game.rng
+        start, end = self.delays
+        ramp = max(1, self.enemies_to_kill - 1)
+        total = spec.weights[-1]
+        last_type = len(spec.enemy_types) - 1
+
+        first = len(self.timeline)
+        for i in range(first, first + self.enemies_to_kill + self.max_enemies_on_screen):
+            delay = round(start + (end - start) * min(i, ramp) / ramp)
+            x = rng.randint(spec.spawn_margin, SCREEN_WIDTH - spec.spawn_margin)
+            index = bisect.bisect_right(spec.weights, rng.random() * total)
+            self.timeline.append((delay, x, spec.enemy_types[min(index, last_type)]))
+
+    def _schedule_spawn(self):
+        """Таймер следующего спавна расписания (отсчёт - от предыдущего спавна)"""
+        if self.spawn_timer is not None:
+            self.spawn_timer.cancel()
+        self.spawn_ready = False
+        delay = self.timeline[self.next_spawn][0]
+        game = self.game
+        self.spawn_timer = game.timers.after(game.clock.ms_to_ticks(delay), self._spawn_due)
+
+    def _spawn_due(self):
+        """Задержка спавна вышла: спавн сразу или, если экран полон, как только освободится место"""
+        self.spawn_timer = None
+        self.spawn_ready = True
+        self._try_spawn()
+
+    def _try_spawn(self):
+        """Спавн следующего врага расписания, если есть место"""
+        if self.boss_spawned or self.on_screen() >= self.max_enemies_on_screen:
+            return
+        _, x, enemy_class = self.timeline[self.next_spawn]
+        self.next_spawn += 1
+        if self.next_spawn == len(self.timeline):
+            self._extend()
+        self.spawn_enemy(enemy_class, x)
+        self._schedule_spawn()
+
+    def update(self):
+        """Обновление уровня"""
+        if not self.boss_spawned:
+            if self.enemies_killed >= self.enemies_to_kill:
+                self._kill_all_enemies()
+                self.spawn_boss()
+            elif self.spawn_ready:
+                self._try_spawn()
+
+        self._check_escaped_enemies()
+
+    def on_screen(self):
+        """Сколько врагов на экране идёт в предел max_enemies_on_screen"""
+        return len(self.game.enemies)
+
+    def _kill_all_enemies(self):
+        """Убить всех обычных врагов"""
+        for enemy in list(self.game.enemies):
+            if not enemy.is_boss:
+                enemy.kill()
+
+    def _check_escaped_enemies(self):
+        """Враги, улетевшие за экран, засчитываются как убитые"""
+        for enemy in list(self.game.enemies):
+            if enemy.rect.top > SCREEN_HEIGHT + 50:
+                if not enemy.is_boss:
+                    self.enemies_killed += 1
+                enemy.kill()
+
+    def spawn_enemy(self, enemy_class, x):
+        """Спавн обычного врага"""
+        enemy = enemy_class(x, self.spec.spawn_y, level=self.enemy_level)
+        self.game.add_enemy(enemy)
+
+    def spawn_boss(self):
+        """Спавн босса"""
+        self.boss_spawned = True
+        if self.spawn_timer is not None:
+            self.spawn_timer.cancel()
+        x, y = self.spec.boss_pos
+        boss = self.spec.boss_type(x, y, level=self.enemy_level)
+        self.game.add_enemy(boss)
+
+    def on_enemy_defeated(self, enemy):
+        """Вызывается при уничтожении врага"""
+        if not enemy.is_boss:
+            self.enemies_killed += 1
+        else:
+            self.boss_defeated = True
+
+    def is_completed(self):
+        """Проверка завершения уровня"""
+        return self.boss_defeated
+
+    def get_progress(self):
+        """Получение прогресса уровня"""
+        if self.boss_spawned:
+            return 100
+        return min(100, int((self.enemies_killed / self.enemies_to_kill) * 100))
+
+
+class EndlessLevel(WaveLevel):
+    """Бесконечный режим: каждая волна больше предыдущей, верхнего предела нет
+
+    Первая волна - параметры описания; каждая следующая добавляет шаги из
+    блока "waves": цель по убийствам, предел врагов на экране, множитель
+    задержки спавна, боссов и силу врагов. Волна сменяется, когда набрана
+    цель или прошло duration мс, поэтому нагрузка растёт и без убийств.
+
+    Среднее время кадра за BUDGET_WINDOW кадров сравнивается с BUDGETS_MS;
+    первое превышение каждого бюджета запоминается в budget_breaks
+    вместе с номером волны и числом объектов (сводку печатает headless.py).
+    """
+
+    BUDGETS_MS = (16.6, 33.0)
+    BUDGET_WINDOW = 30
+
+    def __init__(self, game, spec):
+        super().__init__(game, spec)
+        self.wave = 1
+        self.wave_timer = self._schedule_wave()
+        self.title = f"{spec.name}: wave {self.wave}"
+        self.bosses = pygame.sprite.Group()
+        self.frame_times = deque(maxlen=self.BUDGET_WINDOW)
+        self.budget_breaks = {}  # бюджет в мс -> волна и счётчики объектов
+
+    def next_wave(self):
+        """Следующая волна: всё растёт на шаг из описания, выходят боссы"""
+        spec = self.spec
+        waves = spec.waves
+        self.wave += 1
+        step = self.wave - 1
+        self.wave_timer.cancel()
+        self.wave_timer = self._schedule_wave()
+        self.title = f"{spec.name}: wave {self.wave}"
+        self.enemies_killed = 0
+        self.enemies_to_kill = spec.enemies_to_kill + waves["enemies_to_kill"] * step
+        self.max_enemies_on_screen = spec.max_enemies_on_screen + waves["max_enemies_on_screen"] * step
+        self.enemy_level = spec.enemy_level + int(waves["enemy_level"] * step)
+        self.compile(spawn_delay=spec.spawn_delay[0] * waves["spawn_delay"] ** step)
+
+        # Боссы волны распределяются по ширине экрана
+        count = waves["bosses"] * step
+        for i in range(count):
+            boss = spec.boss_type(SCREEN_WIDTH * (i + 1) // (count + 1), spec.boss_pos[1], level=self.enemy_level)
+            self.game.add_enemy(boss)
+            self.bosses.add(boss)
+
+    def _schedule_wave(self):
+        """Таймер смены волны по истечении duration мс"""
+        game = self.game
+        return game.timers.after(game.clock.ms_to_ticks(self.spec.waves["duration"]), self.next_wave)
+
+    def on_screen(self):
+        """Боссы копятся от волны к волне и не занимают места обычных врагов"""
+        return len(self.game.enemies) - len(self.bosses)
+
+    def update(self):
+        """Обновление уровня: замер бюджета, смена волны по цели, спавн по расписанию"""
+        self._check_budgets()
+        # Смена волны по времени приходит таймером wave_timer
+        if self.enemies_killed >= self.enemies_to_kill:
+            self.next_wave()
+        super().update()
+
+    def _check_budgets(self):
+        """Первое превышение каждого бюджета кадра - в budget_breaks"""
+        if len(self.budget_breaks) == len(self.BUDGETS_MS):
+            return
+        self.frame_times.append(self.game.profiler.last_frame_ms)
+        if len(self.frame_times) < self.BUDGET_WINDOW:
+            return
+        average = sum(self.frame_times) / len(self.frame_times)
+        for budget in self.BUDGETS_MS:
+            if budget not in self.budget_breaks and average > budget:
+                record = {"wave": self.wave, "frame_ms": round(average, 2)}
+                record.update(self.entity_counts())
+                self.budget_breaks[budget] = record
+
+    def entity_counts(self):
+        """Число объектов на экране"""
+        game = self.game
+        bosses = len(self.bosses)
+        return {
+            "enemies": len(game.enemies) - bosses,
+            "bosses": bosses,
+            "enemy_bullets": len(game.enemy_bullets),
+            "player_bullets": len(game.player_bullets),
+            "particles": len(game.particles),
+        }
+
+    def on_enemy_defeated(self, enemy):
+        """Любое убийство, в том числе босса, идёт в цель волны"""
+        self.enemies_killed += 1
+
+    def is_completed(self):
+        """Бесконечный режим не заканчивается победой"""
+        return False
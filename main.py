@@ -1,72 +1,220 @@
 """
 Space Shooter - Главная точка входа
 """
+import argparse
 import pygame
 import sys
-import random
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, BLACK, DARK_BLUE, WHITE, RED, GREEN
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE, BLACK, DARK_BLUE, WHITE, RED, GREEN, YELLOW,
+    DIRTY_RECTS, IDLE_FPS, IDLE_DELAY, AUDIO_FREQUENCY, AUDIO_BUFFER
+)
 from menu import Menu
 from game import Game
 from sounds import SoundManager
+from profiler import FrameProfiler, DebugOverlay
+from effects import StarField
+from fonts import texts
+from renderer import DirtyRectRenderer
+from highscore import HighScoreStore
+from leaderboard import Leaderboard
+from assets import AssetLoader
+from levels.engine import EndlessLevel, specs
 
 
 class SpaceShooter:
     """Основной класс игры"""
 
-    def __init__(self):
+    def __init__(self, dirty_rects=DIRTY_RECTS):
+        # Параметры микшера задаются до pygame.init
+        pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
         pygame.init()
         pygame.mixer.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
-        self.state = "menu"  # menu, game, game_over, victory
-        self.sound_manager = SoundManager()
+        self.state = "loading"  # loading, menu, game, paused, game_over, victory
+        # Звуки появятся, когда их загрузит AssetLoader
+        self.sound_manager = None
+        self.highscores = HighScoreStore()
+        # None, если базу не открыть: меню и счёт работают и без неё
+        self.leaderboard = Leaderboard.open()
+        # Звёздный фон, общий для меню, игры и финальных экранов (готовит AssetLoader)
+        self.star_field = None
         self.menu = Menu(self)
         self.game = None
-        self.font = pygame.font.Font(None, 36)
         self.selected_level = 1
+        self.profiler = FrameProfiler()
+        self.debug_overlay = DebugOverlay(self.profiler)
+
+        # Вывод статичных экранов грязными прямоугольниками (None - всегда flip).
+        # Звёздный фон в этом режиме стоит, иначе меняется каждая плитка
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects else None
+        self.drawn_state = None
+
+        # Простой: пауза или статичный экран без ввода дольше IDLE_DELAY
+        self.idle = False
+        self.last_activity = pygame.time.get_ticks()
+        self.active_state = self.state
+
+        # Затемнение игры на паузе
+        self.pause_shade = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.pause_shade.fill((0, 0, 0, 150))
+
+        # Ресурсы грузятся в фоне; меню откроется, как только готов звёздный фон.
+        # Шрифты в фон не уходят: SDL_ttf и кэш надписей не потокобезопасны
+        self.loading_text = texts.render("Loading...", 36, WHITE)
+        self.loader = AssetLoader()
+        self.loader.add("stars", self.load_star_field)
+        self.loader.add("sounds", self.load_sounds)
+        self.loader.add("levels", specs.load)
+        self.loader.start()
+        self.loaded = False  # все результаты загрузчика подхвачены
+
+    def load_fonts(self):
+        """Шрифты меню, интерфейса и оверлея (только в главном потоке)"""
+        for size in (20, 24, 28, 36, 48, 72):
+            texts.font(size)
+
+    def load_star_field(self):
+        """Звёздный фон: только рисование слоёв, convert делает take_star_field"""
+        return StarField(SCREEN_WIDTH, SCREEN_HEIGHT, star_count=150, bake=False)
+
+    def load_sounds(self):
+        """Декодирование звуков; каналы микшера настраиваются в главном потоке"""
+        return SoundManager(channels=False)
+
+    def take_star_field(self):
+        """Звёздный фон от AssetLoader; если он не готов или задача упала - строится здесь"""
+        star_field = self.loader.get("stars") or self.load_star_field()
+        star_field.bake()
+        self.star_field = self.menu.star_field = star_field
+
+    def update_loading(self):
+        """Подхват ресурсов по мере готовности"""
+        loader = self.loader
+        # Готовность проверяется до подхвата: задачи, завершившиеся между
+        # кадрами, подхватываются в этом же вызове
+        done = loader.done
+        if self.star_field is None and loader.is_ready("stars"):
+            self.take_star_field()
+        if self.sound_manager is None and loader.is_ready("sounds"):
+            sound_manager = loader.get("sounds")
+            if sound_manager:
+                sound_manager.setup_channels()
+            # Меню, игра и игрок берут sound_manager отсюда при каждом звуке
+            self.sound_manager = sound_manager
+        if self.state == "loading" and self.star_field is not None:
+            self.load_fonts()
+            self.state = "menu"
+        self.loaded = done
 
     def new_game(self, level=1):
         """Создать новую игру"""
+        self.close_game()
+        if self.star_field is None:
+            self.take_star_field()
         self.selected_level = level
         self.game = Game(self, level)
         self.state = "game"
 
+    def close_game(self):
+        """Выбросить текущую игру, вернув её объекты в пулы"""
+        if self.game:
+            self.game.close()
+            self.game = None
+
     def start_level(self, level):
         """Запустить указанный уровень"""
         self.new_game(level)
 
+    def get_keys(self):
+        """Состояние клавиатуры для игрока"""
+        return pygame.key.get_pressed()
+
     def run(self):
         """Главный цикл игры"""
         while self.running:
-            self.clock.tick(FPS)
+            self.idle = self.is_idle()
+            if self.idle:
+                # Пониженная частота: ждём ввода не дольше кадра IDLE_FPS (и не дольше
+                # мигания курсора меню), пришедшее событие возвращается в очередь
+                timeout = 1000 // IDLE_FPS
+                if self.state == "menu":
+                    timeout = min(timeout, self.menu.next_change_ms())
+                event = pygame.event.wait(timeout)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+                self.clock.tick()
+            else:
+                self.clock.tick(FPS)
+            self.profiler.begin_frame()
             self.events()
             self.update()
             self.draw()
+            self.profiler.end_frame()
 
+        self.highscores.close()
+        if self.leaderboard:
+            self.leaderboard.close()
         pygame.quit()
         sys.exit()
 
+    def is_idle(self):
+        """Можно ли снизить частоту цикла: пауза или давно не было ввода на статичном экране
+
+        В простое звёздный фон стоит (см. background_moving), так что на
+        пониженной частоте анимированным остаётся только курсор меню.
+        """
+        now = pygame.time.get_ticks()
+        if self.state != self.active_state:
+            # Смена состояния считается активностью
+            self.active_state = self.state
+            self.last_activity = now
+        if self.state == "paused":
+            return True
+        if not self.loaded:
+            return False
+        return self.state != "game" and now - self.last_activity > IDLE_DELAY
+
+    def background_moving(self):
+        """Летит ли звёздный фон статичных экранов: не в простое и не при выводе областями"""
+        return not self.renderer and not self.idle
+
     def events(self):
         """Обработка событий"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
 
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                self.last_activity = pygame.time.get_ticks()
+
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    if self.state == "game":
+                if self.state == "game" and event.key in (pygame.K_ESCAPE, pygame.K_p):
+                    # Пауза: игра остаётся в памяти и продолжается с того же места
+                    self.state = "paused"
+                elif self.state == "paused":
+                    if event.key in (pygame.K_ESCAPE, pygame.K_p):
+                        self.state = "game"
+                    elif event.key == pygame.K_q:
                         self.state = "menu"
-                        self.game = None
-                    elif self.state in ["game_over", "victory"]:
+                        self.close_game()
+                elif self.state in ["game_over", "victory"]:
+                    if event.key == pygame.K_ESCAPE:
                         self.state = "menu"
-                        self.game = None
+                        self.close_game()
+                    elif event.key == pygame.K_RETURN:
+                        self.new_game(self.selected_level if self.state == "game_over" else 1)
 
                 # Быстрый рестарт в игре
                 if event.key == pygame.K_r and self.state == "game":
                     self.new_game(self.selected_level)
 
+                # Отладочный оверлей
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+
             # Обработка событий в меню
             if self.state == "menu":
                 self.menu.handle_event(event)
@@ -77,81 +225,131 @@ class SpaceShooter:
 
     def update(self):
         """Обновление состояния игры"""
+        self.profiler.mark("input")
+        if not self.loaded:
+            self.update_loading()
+
         if self.state == "game" and self.game:
             self.game.update()
             # Проверка окончания игры
             if self.game.player.health <= 0:
                 self.state = "game_over"
+                self.finish_run()
             elif self.game.level_completed:
                 self.state = "victory"
+                self.finish_run()
         elif self.state == "menu":
             self.menu.update()
+        elif self.state in ["game_over", "victory"] and self.background_moving():
+            self.star_field.update(0.5)
+
+    def finish_run(self):
+        """Конец забега: рекорд и запись в таблицу результатов пишутся в фоне"""
+        game = self.game
+        game.score.flush()
+        # В бесконечном режиме "дошёл до" - номер волны
+        reached = game.level.wave if isinstance(game.level, EndlessLevel) else game.current_level_num
+        if self.leaderboard:
+            self.leaderboard.record(game.start_level, reached, game.score.score,
+                                    game.clock.get_ticks(), game.kills, game.seed)
 
     def draw(self):
         """Отрисовка"""
         self.screen.fill(DARK_BLUE)
 
-        if self.state == "menu":
+        if self.state == "loading":
+            self.draw_loading()
+        elif self.state == "menu":
             self.menu.draw(self.screen)
         elif self.state == "game" and self.game:
             self.game.draw(self.screen)
+        elif self.state == "paused" and self.game:
+            self.draw_paused()
         elif self.state == "game_over":
             self.draw_game_over()
         elif self.state == "victory":
             self.draw_victory()
 
-        pygame.display.flip()
+        if self.profiler.enabled and self.state == "game" and self.game:
+            self.debug_overlay.draw(self.screen, self.game)
+        self.profiler.mark("draw")
+
+        self.present()
+        self.profiler.mark("flip")
+
+    def present(self):
+        """Вывод кадра: статичные экраны - только изменившиеся области, игра - flip"""
+        if self.renderer and self.state != "game":
+            if self.state != self.drawn_state:
+                self.renderer.invalidate()
+            self.renderer.present()
+        else:
+            pygame.display.flip()
+        self.drawn_state = self.state
+
+    def draw_loading(self):
+        """Экран загрузки с полосой прогресса"""
+        if self.star_field:
+            self.star_field.draw(self.screen)
+        self.screen.blit(self.loading_text,
+                         self.loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30)))
+
+        bar = pygame.Rect(0, 0, 300, 16)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10)
+        fill = bar.copy()
+        fill.width = int(bar.width * self.loader.progress())
+        pygame.draw.rect(self.screen, (0, 255, 255), fill)
+        pygame.draw.rect(self.screen, WHITE, bar, 1)
+
+    def draw_paused(self):
+        """Экран паузы поверх замершей игры"""
+        self.game.draw(self.screen)
+        self.screen.blit(self.pause_shade, (0, 0))
+
+        text = texts.render("PAUSED", 36, YELLOW)
+        self.screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20)))
+
+        hint = texts.render("ESC or P to resume, Q for menu", 36, WHITE)
+        self.screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30)))
 
     def draw_game_over(self):
         """Экран проигрыша"""
-        self.draw_stars()
+        self.star_field.draw(self.screen)
 
-        text = self.font.render("GAME OVER", True, RED := (255, 0, 0))
+        text = texts.render("GAME OVER", 36, RED := (255, 0, 0))
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(text, text_rect)
 
-        score_text = self.font.render(f"Score: {self.game.score.score if self.game else 0}", True, WHITE)
+        score_text = texts.render(f"Score: {self.game.score.score if self.game else 0}", 36, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(score_text, score_rect)
 
-        restart_text = self.font.render("Press ENTER to restart or ESC for menu", True, WHITE)
+        restart_text = texts.render("Press ENTER to restart or ESC for menu", 36, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
         self.screen.blit(restart_text, restart_rect)
 
-        # Проверка нажатия ENTER
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_RETURN]:
-            self.new_game(self.selected_level)
-
     def draw_victory(self):
         """Экран победы"""
-        self.draw_stars()
+        self.star_field.draw(self.screen)
 
-        text = self.font.render("VICTORY!", True, GREEN := (0, 255, 0))
+        text = texts.render("VICTORY!", 36, GREEN := (0, 255, 0))
         text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
         self.screen.blit(text, text_rect)
 
-        score_text = self.font.render(f"Final Score: {self.game.score.score if self.game else 0}", True, WHITE)
+        score_text = texts.render(f"Final Score: {self.game.score.score if self.game else 0}", 36, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
         self.screen.blit(score_text, score_rect)
 
-        restart_text = self.font.render("Press ENTER to play again or ESC for menu", True, WHITE)
+        restart_text = texts.render("Press ENTER to play again or ESC for menu", 36, WHITE)
         restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
         self.screen.blit(restart_text, restart_rect)
 
-        # Проверка нажатия ENTER
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_RETURN]:
-            self.new_game(1)
-
-    def draw_stars(self):
-        """Рисование звёздного фона"""
-        for _ in range(50):
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            pygame.draw.circle(self.screen, WHITE, (x, y), random.randint(1, 2))
-
 
 if __name__ == "__main__":
-    game = SpaceShooter()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--dirty-rects", action="store_true", default=DIRTY_RECTS,
+                        help="меню и финальные экраны выводить только изменившимися областями "
+                             "(звёздный фон на них стоит)")
+    args = parser.parse_args()
+    game = SpaceShooter(dirty_rects=args.dirty_rects)
     game.run()
@@ -7,6 +7,11 @@ from settings import (
     YELLOW, RED, DARK_BLUE, GREEN
 )
 from sounds import SoundManager
+from fonts import texts
+from levels.engine import ENDLESS_LEVEL, specs
+
+# Полупериод мигания курсора, мс
+CURSOR_BLINK = 333
 
 
 class Menu:
@@ -14,23 +19,37 @@ class Menu:
 
     def __init__(self, game):
         self.game = game
-        self.sound_manager = game.sound_manager
         self.selected_option = 0
-        self.main_options = ["Start Game", "Select Level", "Controls", "Exit"]
-        self.level_options = ["Level 1", "Level 2", "Level 3", "Back"]
+        self.main_options = ["Start Game", "Select Level", "Leaderboard", "Controls", "Exit"]
         self.selected_level = 0
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 36)
         self.title_y = 100
         self.options_y = 280
-        self.blink_timer = 0
         self.show_controls = False
         self.show_level_select = False
-        self.star_field = None
-
-        from effects import StarField
-        self.star_field = StarField(SCREEN_WIDTH, SCREEN_HEIGHT, star_count=150, speed=1)
+        self.show_leaderboard = False
+        self.leaderboard_level = None  # None - все уровни
+        self.star_field = game.star_field
+
+    @property
+    def sound_manager(self):
+        """Звуки приложения (None, пока AssetLoader их не загрузил)"""
+        return self.game.sound_manager
+
+    @property
+    def level_specs(self):
+        """Описания уровней для выбора: обычные по порядку, затем бесконечный режим"""
+        endless = specs.get(ENDLESS_LEVEL)
+        return list(specs) + ([endless] if endless else [])
+
+    @property
+    def level_options(self):
+        """Пункты выбора уровня - по описаниям уровней"""
+        return [self.level_label(spec.number) for spec in self.level_specs] + ["Back"]
+
+    @staticmethod
+    def level_label(number):
+        """Подпись уровня в меню и таблице результатов"""
+        return "Endless" if number == ENDLESS_LEVEL else f"Level {number}"
 
     def handle_event(self, event):
         """Обработка событий меню"""
@@ -42,6 +61,21 @@ class Menu:
                     self.show_controls = False
                 return
 
+            if self.show_leaderboard:
+                if event.key == pygame.K_ESCAPE or event.key == pygame.K_RETURN:
+                    if self.sound_manager:
+                        self.sound_manager.play("select")
+                    self.show_leaderboard = False
+                elif event.key in (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d):
+                    # Переключение: все уровни -> 1 -> 2 -> ... -> бесконечный -> все уровни
+                    filters = [None] + [spec.number for spec in self.level_specs]
+                    step = 1 if event.key in (pygame.K_RIGHT, pygame.K_d) else -1
+                    index = (filters.index(self.leaderboard_level) + step) % len(filters)
+                    self.leaderboard_level = filters[index]
+                    if self.sound_manager:
+                        self.sound_manager.play("select")
+                return
+
             if self.show_level_select:
                 if event.key == pygame.K_UP or event.key == pygame.K_w:
                     self.selected_level = (self.selected_level - 1) % len(self.level_options)
@@ -52,14 +86,15 @@ class Menu:
                     if self.sound_manager:
                         self.sound_manager.play("select")
                 elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                    if self.selected_level == 3:  # Back
+                    level_specs = self.level_specs
+                    if self.selected_level == len(level_specs):  # Back
                         if self.sound_manager:
                             self.sound_manager.play("select")
                         self.show_level_select = False
                         self.selected_option = 0
                     else:
                         # Выбор уровня
-                        self.game.start_level(self.selected_level + 1)
+                        self.game.start_level(level_specs[self.selected_level].number)
                 return
 
             # Главное меню
@@ -82,15 +117,25 @@ class Menu:
             self.show_level_select = True
             self.selected_level = 0
         elif self.selected_option == 2:
-            self.show_controls = True
+            self.show_leaderboard = True
         elif self.selected_option == 3:
+            self.show_controls = True
+        elif self.selected_option == 4:
             self.game.running = False
 
     def update(self):
         """Обновление меню"""
-        self.blink_timer += 1
-        if self.star_field:
-            self.star_field.update()
+        if self.star_field and self.game.background_moving():
+            # В меню звёзды летят вдвое медленнее, чем в игре
+            self.star_field.update(0.5)
+
+    def cursor_visible(self):
+        """Мигание курсора по реальному времени (не зависит от частоты кадров)"""
+        return pygame.time.get_ticks() % (2 * CURSOR_BLINK) < CURSOR_BLINK
+
+    def next_change_ms(self):
+        """Через сколько мс курсор мигнёт (в простое цикл просыпается к этому моменту)"""
+        return CURSOR_BLINK - pygame.time.get_ticks() % CURSOR_BLINK
 
     def draw(self, surface):
         """Отрисовка меню"""
@@ -101,6 +146,8 @@ class Menu:
 
         if self.show_controls:
             self.draw_controls(surface)
+        elif self.show_leaderboard:
+            self.draw_leaderboard(surface)
         elif self.show_level_select:
             self.draw_level_select(surface)
         else:
@@ -109,13 +156,13 @@ class Menu:
     def draw_main_menu(self, surface):
         """Отрисовка главного меню"""
         # Заголовок
-        title = self.font_large.render("SPACE SHOOTER", True, CYAN)
+        title = texts.render("SPACE SHOOTER", 72, CYAN)
         title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=self.title_y)
 
         # Эффект свечения
         for i in range(3, 0, -1):
             glow_color = (0, 255 // i, 255 // i)
-            glow_surface = self.font_large.render("SPACE SHOOTER", True, glow_color)
+            glow_surface = texts.render("SPACE SHOOTER", 72, glow_color)
             glow_rect = glow_surface.get_rect(centerx=SCREEN_WIDTH // 2 + i, y=self.title_y + i)
             surface.blit(glow_surface, glow_rect)
             glow_rect = glow_surface.get_rect(centerx=SCREEN_WIDTH // 2 - i, y=self.title_y - i)
@@ -124,7 +171,7 @@ class Menu:
         surface.blit(title, title_rect)
 
         # Подзаголовок
-        subtitle = self.font_small.render("The Final Battle", True, WHITE)
+        subtitle = texts.render("The Final Battle", 36, WHITE)
         subtitle_rect = subtitle.get_rect(centerx=SCREEN_WIDTH // 2, y=self.title_y + 70)
         surface.blit(subtitle, subtitle_rect)
 
@@ -133,64 +180,98 @@ class Menu:
             y = self.options_y + i * 60
 
             if i == self.selected_option:
-                if self.blink_timer % 40 < 20:
-                    cursor = self.font_medium.render("►", True, YELLOW)
+                if self.cursor_visible():
+                    cursor = texts.render("►", 48, YELLOW)
                     cursor_rect = cursor.get_rect(x=SCREEN_WIDTH // 2 - 150, centery=y)
                     surface.blit(cursor, cursor_rect)
 
-                text = self.font_medium.render(option, True, YELLOW)
+                text = texts.render(option, 48, YELLOW)
             else:
-                text = self.font_medium.render(option, True, WHITE)
+                text = texts.render(option, 48, WHITE)
 
             text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, centery=y)
             surface.blit(text, text_rect)
 
         # Управление внизу
-        controls_hint = self.font_small.render("↑↓ to select | ENTER to confirm | ESC to quit", True, (150, 150, 150))
+        controls_hint = texts.render("↑↓ to select | ENTER to confirm | ESC to quit", 36, (150, 150, 150))
         controls_rect = controls_hint.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50)
         surface.blit(controls_hint, controls_rect)
 
     def draw_level_select(self, surface):
         """Отрисовка выбора уровня"""
         # Заголовок
-        title = self.font_medium.render("SELECT LEVEL", True, CYAN)
+        title = texts.render("SELECT LEVEL", 48, CYAN)
         title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=100)
         surface.blit(title, title_rect)
 
-        # Опции уровней
+        # Опции уровней: пунктов больше, чем в главном меню, поэтому плотнее
+        top, step = 180, 45
         for i, option in enumerate(self.level_options):
-            y = self.options_y + i * 60
+            y = top + i * step
 
             if i == self.selected_level:
-                if self.blink_timer % 40 < 20:
-                    cursor = self.font_medium.render("►", True, YELLOW)
+                if self.cursor_visible():
+                    cursor = texts.render("►", 48, YELLOW)
                     cursor_rect = cursor.get_rect(x=SCREEN_WIDTH // 2 - 150, centery=y)
                     surface.blit(cursor, cursor_rect)
 
-                text = self.font_medium.render(option, True, YELLOW)
+                text = texts.render(option, 48, YELLOW)
             else:
-                text = self.font_medium.render(option, True, WHITE)
+                text = texts.render(option, 48, WHITE)
 
             text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, centery=y)
             surface.blit(text, text_rect)
 
         # Описание уровней
-        level_descriptions = [
-            "Level 1: Introduction - Easy enemies, slow pace",
-            "Level 2: Escalation - Mixed enemies, medium pace",
-            "Level 3: Final Battle - Hard enemies, fast pace"
-        ]
+        level_descriptions = []
+        for spec in self.level_specs:
+            if spec.number == ENDLESS_LEVEL:
+                level_descriptions.append(f"{spec.name}: {spec.description}")
+            else:
+                level_descriptions.append(f"Level {spec.number}: {spec.name} - {spec.description}")
 
         for i, desc in enumerate(level_descriptions):
-            y = self.options_y + len(self.level_options) * 60 + i * 30
-            text = self.font_small.render(desc, True, (150, 150, 150))
+            y = top + len(self.level_options) * step + i * 30
+            text = texts.render(desc, 36, (150, 150, 150))
             text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, y=y)
             surface.blit(text, text_rect)
 
+    def draw_leaderboard(self, surface):
+        """Отрисовка таблицы результатов"""
+        title = texts.render("LEADERBOARD", 48, CYAN)
+        surface.blit(title, title.get_rect(centerx=SCREEN_WIDTH // 2, y=60))
+
+        level = self.leaderboard_level
+        caption = "All levels" if level is None else self.level_label(level)
+        subtitle = texts.render(f"< {caption} >", 36, YELLOW)
+        surface.blit(subtitle, subtitle.get_rect(centerx=SCREEN_WIDTH // 2, y=110))
+
+        runs = self.game.leaderboard.top(10, level) if self.game.leaderboard else []
+        columns = [("#", 110), ("Score", 200), ("Level", 330), ("Kills", 430), ("Time", 530)]
+        for name, x in columns:
+            surface.blit(texts.render(name, 36, (150, 150, 150)), (x, 160))
+
+        for i, run in enumerate(runs):
+            y = 195 + i * 30
+            seconds = run["duration_ms"] // 1000
+            # Уровень-достигнутый уровень, для бесконечного режима E-волна
+            start = "E" if run["level"] == ENDLESS_LEVEL else run["level"]
+            values = [str(i + 1), str(run["score"]), f"{start}-{run['reached']}",
+                      str(run["kills"]), f"{seconds // 60}:{seconds % 60:02d}"]
+            for (_, x), value in zip(columns, values):
+                surface.blit(texts.render(value, 36, WHITE), (x, y))
+
+        if not runs:
+            empty = texts.render("No runs yet", 36, WHITE)
+            surface.blit(empty, empty.get_rect(centerx=SCREEN_WIDTH // 2, y=240))
+
+        hint = texts.render("<- -> level | ENTER or ESC to return", 36, (150, 150, 150))
+        surface.blit(hint, hint.get_rect(centerx=SCREEN_WIDTH // 2, y=SCREEN_HEIGHT - 50))
+
     def draw_controls(self, surface):
         """Отрисовка экрана управления"""
         # Заголовок
-        title = self.font_medium.render("CONTROLS", True, CYAN)
+        title = texts.render("CONTROLS", 48, CYAN)
         title_rect = title.get_rect(centerx=SCREEN_WIDTH // 2, y=100)
         surface.blit(title, title_rect)
 
@@ -198,7 +279,7 @@ class Menu:
         controls = [
             "Movement: WASD or Arrow Keys",
             "Shoot: SPACE",
-            "Pause/Menu: ESC",
+            "Pause: ESC or P",
             "",
             "Destroy enemies to earn points",
             "Avoid enemy bullets and collisions",
@@ -213,7 +294,7 @@ class Menu:
             else:
                 color = WHITE
 
-            text = self.font_small.render(line, True, color)
+            text = texts.render(line, 36, color)
             text_rect = text.get_rect(centerx=SCREEN_WIDTH // 2, y=180 + i * 35)
             surface.blit(text, text_rect)
 
@@ -0,0 +1,190 @@
+"""
+Паттерны движения врагов: пакетные ядра на NumPy
+"""
+import numpy as np
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Таблица синусов на полный круг (размер - степень двойки, индекс берётся по маске)
+TRIG_TABLE_SIZE = 4096
+SIN_TABLE = np.sin(np.arange(TRIG_TABLE_SIZE) * (2 * np.pi / TRIG_TABLE_SIZE))
+
+# Паттерн движения -> ядро
+KERNELS = {}
+
+
+def register(pattern):
+    """Декоратор: ядро для паттерна движения pattern
+
+    Ядро получает массивы одного размера - фазу (move_timer, уже с шагом
+    этого кадра), x, y (левый верхний угол, float), start_x и speed - и
+    меняет x и y на месте. Новый паттерн не требует правок Enemy.update.
+    """
+    def decorator(kernel):
+        KERNELS[pattern] = kernel
+        return kernel
+    return decorator
+
+
+def table_sin(angle):
+    """Синус по таблице (угол неотрицательный, индекс - ближайший отсчёт)"""
+    index = (angle * (TRIG_TABLE_SIZE / (2 * np.pi)) + 0.5).astype(np.intp)
+    return SIN_TABLE[index & (TRIG_TABLE_SIZE - 1)]
+
+
+def table_cos(angle):
+    """Косинус по таблице (сдвиг на четверть круга)"""
+    return table_sin(angle + np.pi / 2)
+
+
+@register("straight")
+def straight(phase, x, y, start_x, speed):
+    """Прямо вниз"""
+    y += speed
+
+
+@register("sine")
+def sine(phase, x, y, start_x, speed):
+    """Вниз с качанием по синусоиде"""
+    y += speed
+    x[:] = start_x + table_sin(phase * 0.03) * 50
+
+
+@register("zigzag")
+def zigzag(phase, x, y, start_x, speed):
+    """Вниз зигзагом: полсекунды вправо, полсекунды влево"""
+    y += speed
+    x += np.where(phase % 60 < 30, 1, -1)
+
+
+@register("circle")
+def circle(phase, x, y, start_x, speed):
+    """Медленно вниз с покачиванием по косинусу"""
+    y += speed * 0.7
+    x[:] = start_x + table_cos(phase * 0.02) * 30
+
+
+class MovementSystem:
+    """Движение врагов: фаза, позиция, start_x, скорость и ширина в массивах NumPy
+
+    Враги регистрируются при появлении (Game.add_enemy), дальше состояние
+    движения живёт здесь, у спрайта обновляется только rect. Строки
+    отсортированы по паттерну, поэтому каждое ядро получает срезы-
+    представления своих врагов, а телепортация, удаление ушедших вниз и
+    запись в rect делаются одним проходом на всех. Позиции - float, в Rect
+    попадает округление, поэтому дробная скорость не теряется.
+
+    Убитый враг (Enemy.kill) помечает систему, и она выбрасывает мёртвых
+    на следующем шаге. Враги без ядра (босс) двигаются своим update.
+    """
+
+    FIELDS = ("phase", "x", "y", "start_x", "speed", "width")
+
+    def __init__(self, capacity=32):
+        self.sprites = []
+        self.counts = {}  # паттерн -> число врагов (строки идут в этом порядке)
+        self.dirty = False
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(capacity))
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def _grow(self):
+        """Удвоение ёмкости массивов"""
+        n = len(self.sprites)
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+    def add(self, enemy):
+        """Взять врага под управление, если для его паттерна есть ядро"""
+        pattern = enemy.move_pattern
+        if pattern not in KERNELS:
+            return False
+        n = len(self.sprites)
+        if n == len(self.x):
+            self._grow()
+
+        # Место - в конце строк своего паттерна, хвост сдвигается на одну строку
+        self.counts[pattern] = self.counts.get(pattern, 0) + 1
+        i = 0
+        for name, count in self.counts.items():
+            i += count
+            if name == pattern:
+                break
+        i -= 1
+        state = (enemy.move_timer, enemy.rect.x, enemy.rect.y, enemy.start_x, enemy.speed, enemy.rect.width)
+        for name, value in zip(self.FIELDS, state):
+            array = getattr(self, name)
+            array[i + 1:n + 1] = array[i:n]
+            array[i] = value
+        self.sprites.insert(i, enemy)
+        enemy.movement = self
+        return True
+
+    def _keep(self, keep):
+        """Оставить только врагов, отмеченных в keep (порядок сохраняется)"""
+        n = len(self.sprites)
+        kept = int(np.count_nonzero(keep))
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+        self.sprites = [enemy for enemy, flag in zip(self.sprites, keep.tolist()) if flag]
+        counts = dict.fromkeys(self.counts, 0)
+        for enemy in self.sprites:
+            counts[enemy.move_pattern] += 1
+        self.counts = counts
+
+    def step(self):
+        """Один шаг движения всех зарегистрированных врагов"""
+        # Убитые с прошлого шага (пули, столкновения, уровень) выбывают
+        if self.dirty:
+            self.dirty = False
+            self._keep(np.array([enemy.alive() for enemy in self.sprites], dtype=bool))
+        n = len(self.sprites)
+        if not n:
+            return
+
+        phase = self.phase[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        start_x = self.start_x[:n]
+        speed = self.speed[:n]
+        width = self.width[:n]
+        phase += 1
+
+        start = 0
+        for pattern, count in self.counts.items():
+            if count:
+                end = start + count
+                KERNELS[pattern](phase[start:end], x[start:end], y[start:end],
+                                 start_x[start:end], speed[start:end])
+                start = end
+
+        # Телепортация по X (по округлённым координатам, как у Rect);
+        # точные маски считаются, только если кто-то у края.
+        # Проверки по спискам: на малых массивах это дешевле редукций NumPy
+        xs = x.tolist()
+        ys = y.tolist()
+        if min(xs) < 0 or max(xs) >= SCREEN_WIDTH:
+            left = np.rint(x)
+            out_left = left + width < 0
+            out_right = left > SCREEN_WIDTH
+            x[out_left] = SCREEN_WIDTH
+            start_x[out_left] = SCREEN_WIDTH + width[out_left] // 2
+            x[out_right] = -width[out_right]
+            start_x[out_right] = -width[out_right] // 2
+            xs = x.tolist()
+
+        for enemy, topleft in zip(self.sprites, zip(xs, ys)):
+            enemy.rect.topleft = topleft
+
+        # Ушедшие слишком далеко вниз убираются без очков
+        if max(ys) > SCREEN_HEIGHT + 50:
+            gone = np.rint(y) > SCREEN_HEIGHT + 50
+            for i in np.flatnonzero(gone).tolist():
+                self.sprites[i].kill()
+            self._keep(~gone)
+            self.dirty = False
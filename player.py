@@ -9,10 +9,15 @@ from settings import (
     WHITE, GREEN, RED, YELLOW, CYAN
 )
 from sounds import SoundManager
+from collision import bounding_radius
+from image_cache import images
+from fonts import texts
 
 
 class Player(pygame.sprite.Sprite):
     """Класс игрока"""
+
+    collision_shape = "mask"
     
     def __init__(self, game):
         super().__init__()
@@ -23,18 +28,18 @@ class Player(pygame.sprite.Sprite):
         self.score = 0
         self.last_shot = 0
         self.invincible = False
-        self.invincible_timer = 0
+        self.invincible_timer = None  # таймер конца неуязвимости в колесе игры
         self.invincible_duration = 2000  # 2 секунды неуязвимости после получения урона
-        self.sound_manager = game.sound_manager
         
         # Создание изображения корабля
-        self.image = self.create_ship_image()
+        self.image = images.image(("player",), self.create_ship_image)
         self.rect = self.image.get_rect()
         self.rect.centerx = SCREEN_WIDTH // 2
         self.rect.bottom = SCREEN_HEIGHT - 20
         
         # Маска для коллизий
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = images.mask(("player",), self.create_ship_image)
+        self.radius = bounding_radius(self.rect)
         
         # Вектор движения
         self.vel_x = 0
@@ -42,6 +47,11 @@ class Player(pygame.sprite.Sprite):
         self.friction = 0.92
         self.acceleration = 0.5
     
+    @property
+    def sound_manager(self):
+        """Звуки игры (берутся при каждом звуке: загрузка могла закончиться после старта)"""
+        return self.game.sound_manager
+
     def create_ship_image(self):
         """Создание изображения корабля игрока"""
         size = 40
@@ -99,23 +109,16 @@ class Player(pygame.sprite.Sprite):
             self.rect.top = SCREEN_HEIGHT
         elif self.rect.top > SCREEN_HEIGHT:
             self.rect.bottom = 0
-        
-        # Обновление таймера неуязвимости
-        if self.invincible:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.invincible_timer > self.invincible_duration:
-                self.invincible = False
     
     def shoot(self):
         """Стрельба"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.clock.get_ticks()
         if current_time - self.last_shot > PLAYER_SHOOT_DELAY:
             self.last_shot = current_time
             # Создаём пулю
             from bullets import Bullet
-            bullet = Bullet(self.rect.centerx, self.rect.top, -1)
-            self.game.all_sprites.add(bullet)
-            self.game.player_bullets.add(bullet)
+            bullet = Bullet.pool.acquire(self.rect.centerx, self.rect.top, -1)
+            self.game.player_bullets.launch(bullet)
             # Воспроизведение звука выстрела
             if self.sound_manager:
                 self.sound_manager.play("shoot")
@@ -127,16 +130,20 @@ class Player(pygame.sprite.Sprite):
         if not self.invincible:
             self.health -= damage
             self.invincible = True
-            self.invincible_timer = pygame.time.get_ticks()
+            self.invincible_timer = self.game.timers.after(
+                self.game.clock.ms_to_ticks(self.invincible_duration), self.end_invincibility)
 
             # Создание эффекта взрыва
-            from effects import Explosion
-            explosion = Explosion(self.rect.centerx, self.rect.centery, color=RED, size=20)
-            self.game.all_sprites.add(explosion)
+            self.game.explosions.emit(self.rect.centerx, self.rect.centery, color=RED, size=20)
 
             if self.health <= 0:
                 self.health = 0
     
+    def end_invincibility(self):
+        """Конец неуязвимости (по таймеру)"""
+        self.invincible = False
+        self.invincible_timer = None
+
     def heal(self, amount):
         """Лечение"""
         self.health = min(self.max_health, self.health + amount)
@@ -145,7 +152,7 @@ class Player(pygame.sprite.Sprite):
         """Отрисовка игрока с эффектом мигания при неуязвимости"""
         if self.invincible:
             # Мигание
-            if pygame.time.get_ticks() % 100 < 50:
+            if self.game.clock.get_ticks() % 100 < 50:
                 surface.blit(self.image, self.rect)
         else:
             surface.blit(self.image, self.rect)
@@ -168,5 +175,5 @@ class Player(pygame.sprite.Sprite):
         pygame.draw.rect(surface, WHITE, border_rect, 2)
         
         # Текст
-        health_text = pygame.font.Font(None, 24).render(f"HP: {self.health}/{self.max_health}", True, WHITE)
+        health_text = texts.render(f"HP: {self.health}/{self.max_health}", 24, WHITE)
         surface.blit(health_text, (15, 12))
@@ -0,0 +1,69 @@
+"""
+Пулы переиспользуемых объектов
+"""
+import pygame
+
+
+class ObjectPool:
+    """Пул объектов: acquire берёт свободный экземпляр и вызывает у него reset(...)"""
+
+    # Все созданные пулы (для статистики)
+    registry = []
+
+    def __init__(self, factory, name=None, max_free=256):
+        self.factory = factory
+        self.name = name or factory.__name__
+        self.max_free = max_free
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.in_use = 0
+        self.high_water = 0
+        ObjectPool.registry.append(self)
+
+    def acquire(self, *args, **kwargs):
+        """Взять объект из пула или создать новый"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            self.misses += 1
+        obj.released = False
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Вернуть объект в пул (повторный возврат игнорируется)"""
+        if obj.released:
+            return
+        obj.released = True
+        self.in_use -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def stats(self):
+        """Статистика пула"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    """Спрайт, который при kill() возвращается в свой пул"""
+
+    pool = None
+    released = False
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
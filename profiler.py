@@ -0,0 +1,134 @@
+"""
+Покадровый профайлер и отладочный оверлей (F3)
+"""
+import time
+from collections import deque
+import pygame
+from settings import FPS, WHITE, GREEN, YELLOW, RED
+from pool import ObjectPool
+from fonts import texts
+
+
+# Фазы кадра в порядке выполнения
+PHASES = (
+    "input", "stars", "player", "bullets", "enemies", "level",
+    "timers", "collisions", "effects", "draw", "flip"
+)
+
+
+class FrameProfiler:
+    """Замер времени фаз кадра; выключенный меряет только время кадра целиком"""
+
+    def __init__(self, history=120, smoothing=0.1):
+        self.enabled = False
+        self.smoothing = smoothing
+        self.phase_ms = dict.fromkeys(PHASES, 0.0)
+        self.frame_history = deque(maxlen=history)
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._frame_start = 0.0
+        self._last = 0.0
+        # Время последнего кадра меряется всегда (нужно бесконечному режиму)
+        self.last_frame_ms = 0.0
+
+    def toggle(self):
+        """Включение/выключение замеров"""
+        self.enabled = not self.enabled
+        self.frame_history.clear()
+
+    def begin_frame(self):
+        """Начало кадра"""
+        self._frame_start = time.perf_counter()
+        if not self.enabled:
+            return
+        for phase in self._current:
+            self._current[phase] = 0.0
+        self._last = self._frame_start
+
+    def mark(self, phase):
+        """Завершение фазы: время с предыдущей отметки уходит в phase"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Конец кадра: сглаживание фаз и запись времени кадра в историю"""
+        self.last_frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        if not self.enabled:
+            return
+        k = self.smoothing
+        for phase, seconds in self._current.items():
+            self.phase_ms[phase] += (seconds * 1000 - self.phase_ms[phase]) * k
+        self.frame_history.append(self.last_frame_ms)
+
+
+class DebugOverlay:
+    """Оверлей с графиком времени кадра, фазами и счётчиками объектов"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.width = 220
+        self.graph_height = 60
+        self.budget_ms = 1000 / FPS
+        self.panel = pygame.Surface((self.width, 410), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 160))
+
+    def counts(self, game):
+        """Счётчики объектов в игре"""
+        return [
+            ("sprites", len(game.all_sprites)),
+            ("enemies", len(game.enemies)),
+            ("bullets", len(game.player_bullets) + len(game.enemy_bullets)),
+            ("particles", len(game.particles)),
+            ("popups", len(game.popups)),
+        ]
+
+    def draw(self, surface, game):
+        """Отрисовка оверлея"""
+        x, y = 10, 70
+        surface.blit(self.panel, (x - 5, y - 5))
+
+        # График времени кадра: линия бюджета и столбики последних кадров
+        history = self.profiler.frame_history
+        scale = self.graph_height / (self.budget_ms * 2)
+        bottom = y + self.graph_height
+        budget_y = bottom - int(self.budget_ms * scale)
+        pygame.draw.line(surface, RED, (x, budget_y), (x + self.width - 10, budget_y))
+        for i, frame_ms in enumerate(history):
+            height = min(self.graph_height, int(frame_ms * scale))
+            color = GREEN if frame_ms <= self.budget_ms else YELLOW
+            pygame.draw.line(surface, color, (x + i, bottom), (x + i, bottom - height))
+
+        y = bottom + 5
+        last = history[-1] if history else 0.0
+        self._row(surface, "frame", f"{last:.2f} ms", x, y, WHITE)
+        y += 18
+
+        for phase in PHASES:
+            self._row(surface, phase, f"{self.profiler.phase_ms[phase]:.2f} ms", x, y, (200, 200, 200))
+            y += 16
+
+        y += 4
+        for name, count in self.counts(game):
+            self._row(surface, name, str(count), x, y, (150, 200, 255))
+            y += 16
+
+        # Пулы: попадания/промахи и максимум одновременно выданных
+        y += 4
+        for pool in ObjectPool.registry:
+            stats = pool.stats()
+            self._row(surface, f"{pool.name} pool",
+                      f"{stats['hits']}/{stats['misses']} hw {stats['high_water']}", x, y, (200, 180, 120))
+            y += 16
+
+        # Кэш надписей: попадания/промахи и размер
+        stats = texts.stats()
+        self._row(surface, "text cache", f"{stats['hits']}/{stats['misses']} n {stats['size']}",
+                  x, y, (200, 180, 120))
+
+    def _row(self, surface, name, value, x, y, color):
+        """Строка: название слева, значение выровнено по правому краю"""
+        surface.blit(texts.render(name, 20, color), (x, y))
+        value_text = texts.render(value, 20, color)
+        surface.blit(value_text, value_text.get_rect(topright=(x + self.width - 20, y)))
@@ -0,0 +1,81 @@
+"""
+Вывод кадра на дисплей только изменившимися областями (грязные прямоугольники)
+"""
+import numpy as np
+import pygame
+
+
+class DirtyRectRenderer:
+    """Вывод на дисплей только плиток, изменившихся с прошлого кадра
+
+    Кадр по-прежнему рисуется в screen целиком, но display.update получает
+    лишь плитки, пиксели которых отличаются от прошлого кадра (сравнение в NumPy);
+    соседние плитки одной строки сливаются в один прямоугольник.
+    После invalidate() (смена состояния) кадр выводится целиком через flip.
+    Сравнение читает буфер как 32-битные пиксели, поэтому на экране
+    с другой глубиной цвета каждый кадр выводится через flip.
+    """
+
+    def __init__(self, screen, tile=40):
+        self.screen = screen
+        self.tile = tile
+        self.previous = None
+        self.full = True
+        self.last_rects = 0  # сколько прямоугольников ушло на дисплей в прошлом кадре
+
+    def invalidate(self):
+        """Следующий кадр вывести целиком"""
+        self.full = True
+
+    def _pixels(self, buffer):
+        """Пиксели экрана (высота x ширина) поверх буфера поверхности, без копирования"""
+        width, height = self.screen.get_size()
+        pixels = np.frombuffer(buffer, dtype=np.uint32)
+        return pixels.reshape(height, -1)[:, :width]
+
+    def present(self):
+        """Вывод кадра на дисплей"""
+        if self.screen.get_bytesize() != 4:
+            self.previous = None
+            self.last_rects = 1
+            pygame.display.flip()
+            return
+        if self.full or self.previous is None or self.previous.shape[::-1] != self.screen.get_size():
+            self.full = False
+            self.previous = self._pixels(self.screen.get_buffer()).copy()
+            self.last_rects = 1
+            pygame.display.flip()
+            return
+
+        # Буфер блокирует поверхность, поэтому он отпускается до display.update
+        buffer = self.screen.get_buffer()
+        pixels = self._pixels(buffer)
+        rects = []
+        if not np.array_equal(pixels, self.previous):
+            rects = self.changed_rects(pixels != self.previous)
+            np.copyto(self.previous, pixels)
+        del pixels, buffer
+
+        self.last_rects = len(rects)
+        if rects:
+            pygame.display.update(rects)
+
+    def changed_rects(self, diff):
+        """Прямоугольники изменившихся плиток по маске отличий (высота x ширина)"""
+        tile = self.tile
+        bounds = self.screen.get_rect()
+        height, width = diff.shape
+        rows = -(-height // tile)
+        columns = -(-width // tile)
+        if rows * tile != height or columns * tile != width:
+            diff = np.pad(diff, ((0, rows * tile - height), (0, columns * tile - width)))
+        changed = diff.reshape(rows, tile, columns, tile).any(axis=(1, 3))
+
+        rects = []
+        for row in np.flatnonzero(changed.any(axis=1)).tolist():
+            line = changed[row].view(np.int8)
+            # Начала и концы непрерывных отрезков изменившихся плиток
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], line, [0]))))
+            for start, end in zip(edges[::2].tolist(), edges[1::2].tolist()):
+                rects.append(pygame.Rect(start * tile, row * tile, (end - start) * tile, tile).clip(bounds))
+        return rects
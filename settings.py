@@ -8,6 +8,12 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 TITLE = "Space Shooter"
+# Статичные экраны (меню, конец игры) выводить только изменившимися областями;
+# значение по умолчанию для флага main.py --dirty-rects
+DIRTY_RECTS = False
+# Простой (пауза, меню без ввода): частота цикла и задержка перед её снижением
+IDLE_FPS = 5
+IDLE_DELAY = 3000  # мс
 
 # Цвета
 BLACK = (0, 0, 0)
@@ -34,9 +40,13 @@ ENEMY_BULLET_SPEED = 6
 # Враги
 ENEMY_SPAWN_DELAY = 1500  # мс
 
+# Звук: микшер с маленьким буфером ради низкой задержки
+AUDIO_FREQUENCY = 44100
+AUDIO_BUFFER = 512  # сэмплов
+
 # Звёзды (фон)
 STAR_COUNT = 100
 STAR_SPEED = 2
 
-# Уровни
-TOTAL_LEVELS = 3
+# Симуляция
+SIM_TICK_RATE = FPS  # тиков симуляции в секунду (движение задано в пикселях за тик)
@@ -0,0 +1,29 @@
+"""
+Часы симуляции
+"""
+from settings import SIM_TICK_RATE
+
+
+class SimClock:
+    """Часы симуляции: время идёт фиксированными тиками, а не по реальным часам
+
+    Частота тиков постоянна (SIM_TICK_RATE): движение задано в пикселях
+    за тик, и пересчёт мс в тики верен только при этой частоте.
+    """
+
+    tick_rate = SIM_TICK_RATE
+
+    def __init__(self):
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        """Продвинуть время на заданное число тиков"""
+        self.ticks += ticks
+
+    def get_ticks(self):
+        """Время симуляции в мс (замена pygame.time.get_ticks)"""
+        return self.ticks * 1000 // self.tick_rate
+
+    def ms_to_ticks(self, ms):
+        """Сколько тиков занимает ms миллисекунд (с округлением вверх)"""
+        return -int(-ms * self.tick_rate // 1000)
@@ -0,0 +1,80 @@
+"""
+Кэш декодированных звуков (сырой PCM в формате микшера)
+"""
+import hashlib
+import mmap
+import os
+import tempfile
+import pygame
+
+# Кэш лежит рядом со звуками
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "sounds", ".cache")
+
+
+class SoundCache:
+    """Звуки из MP3 декодируются один раз, дальше загружаются готовым PCM
+
+    Ключ файла кэша - хеш исходного файла и настройки микшера (частота,
+    формат, каналы), поэтому смена звука или микшера даёт новый файл.
+    PCM читается через mmap и передаётся в pygame.mixer.Sound(buffer=...).
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def cache_path(self, path):
+        """Путь к PCM-файлу для звука path при текущих настройках микшера (None без микшера)"""
+        mixer = pygame.mixer.get_init()
+        if mixer is None:
+            return None
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        frequency, size, channels = mixer
+        return os.path.join(self.cache_dir, f"{digest}-{frequency}-{size}-{channels}.pcm")
+
+    def load(self, path):
+        """Звук из кэша или из исходного файла (с сохранением в кэш)"""
+        cached = self.cache_path(path)
+        if cached is None:
+            # Микшер не запущен: кэшировать не под что, ошибку даст сам Sound
+            return pygame.mixer.Sound(path)
+        try:
+            with open(cached, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sound = pygame.mixer.Sound(buffer=data)
+            self.hits += 1
+            return sound
+        except (OSError, ValueError):
+            pass
+
+        self.misses += 1
+        sound = pygame.mixer.Sound(path)
+        self.store(cached, sound.get_raw())
+        return sound
+
+    def store(self, cached, raw):
+        """Атомарная запись PCM в кэш (ошибки записи не мешают игре)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, cached)
+        except OSError:
+            # Недописанный временный файл не должен копиться в каталоге кэша
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Удаление всех файлов кэша"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pcm"):
+                os.remove(os.path.join(self.cache_dir, name))
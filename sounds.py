@@ -3,15 +3,43 @@
 """
 import pygame
 import os
+from sound_cache import SoundCache
 
 
 class SoundManager:
     """Класс для управления звуковыми эффектами"""
 
-    def __init__(self):
-        """Инициализация звуковой системы"""
+    # Имя звука -> (файл в assets/sounds, громкость)
+    SOUNDS = {
+        "shoot": ("jg-032316-sfx-8-bit-zap-sound-2.mp3", 0.3),          # Выстрел игрока
+        "explosion": ("jg-032316-sfx-8-bit-crash-2.mp3", 0.4),          # Взрыв врага
+        "select": ("jg-032316-sfx-8-bit-button-select.mp3", 0.3),       # Выбор в меню
+        "hit": ("jg-032316-sfx-8-bit-hit-6.mp3", 0.3),                  # Попадание (опционально)
+        "player_hit": ("jg-032316-sfx-8-bit-punch.mp3", 0.35),          # Урон игроку
+    }
+
+    # Группы каналов, зарезервированные под категории звуков: категория -> число каналов
+    CHANNEL_GROUPS = {"ui": 1, "player": 3, "impact": 4}
+
+    # Правила воспроизведения: звук -> (категория, максимум голосов, приоритет, окно слияния в мс)
+    RULES = {
+        "shoot": ("player", 2, 1, 40),
+        "explosion": ("impact", 3, 2, 50),
+        "hit": ("impact", 2, 1, 50),
+        "player_hit": ("impact", 2, 3, 80),
+        "select": ("ui", 1, 1, 0),
+    }
+
+    def __init__(self, cache=None, channels=True):
+        """Инициализация звуковой системы
+
+        channels=False - без настройки каналов микшера (звуки декодируются
+        в фоновом потоке, setup_channels() потом вызывается из главного).
+        """
         self.sounds = {}
         self.enabled = True
+        # Кэш декодированного PCM: MP3 декодируется только при первом запуске
+        self.cache = cache if cache is not None else SoundCache()
         
         # Путь к папке со звуками
         self.sounds_dir = os.path.join(os.path.dirname(__file__), "assets", "sounds")
@@ -19,50 +47,87 @@ class SoundManager:
         # Загрузка звуков
         self._load_sounds()
 
+        # Планировщик: каналы по категориям и текущие голоса на них
+        self.groups = {}
+        self.voices = {}        # канал -> (звук, приоритет, время запуска)
+        self.last_played = {}   # звук -> время последнего запуска
+        self.stats = {"played": 0, "merged": 0, "dropped": 0, "stolen": 0}
+        if channels:
+            self.setup_channels()
+
     def _load_sounds(self):
         """Загрузка всех звуковых файлов"""
         try:
-            # Звук выстрела игрока
-            self.sounds["shoot"] = pygame.mixer.Sound(
-                os.path.join(self.sounds_dir, "jg-032316-sfx-8-bit-zap-sound-2.mp3")
-            )
-            self.sounds["shoot"].set_volume(0.3)
-            
-            # Звук взрыва врагов
-            self.sounds["explosion"] = pygame.mixer.Sound(
-                os.path.join(self.sounds_dir, "jg-032316-sfx-8-bit-crash-2.mp3")
-            )
-            self.sounds["explosion"].set_volume(0.4)
-            
-            # Звук выбора в меню
-            self.sounds["select"] = pygame.mixer.Sound(
-                os.path.join(self.sounds_dir, "jg-032316-sfx-8-bit-button-select.mp3")
-            )
-            self.sounds["select"].set_volume(0.3)
-            
-            # Звук попадания (опционально)
-            self.sounds["hit"] = pygame.mixer.Sound(
-                os.path.join(self.sounds_dir, "jg-032316-sfx-8-bit-hit-6.mp3")
-            )
-            self.sounds["hit"].set_volume(0.3)
-            
-            # Звук получения урона игроком
-            self.sounds["player_hit"] = pygame.mixer.Sound(
-                os.path.join(self.sounds_dir, "jg-032316-sfx-8-bit-punch.mp3")
-            )
-            self.sounds["player_hit"].set_volume(0.35)
-            
+            for name, (filename, volume) in self.SOUNDS.items():
+                self.sounds[name] = self.cache.load(os.path.join(self.sounds_dir, filename))
+                self.sounds[name].set_volume(volume)
         except pygame.error as e:
             print(f"Не удалось загрузить звуки: {e}")
             self.enabled = False
 
-    def play(self, sound_name):
-        """Воспроизведение звука по имени"""
+    def setup_channels(self):
+        """Резервирование каналов под группы категорий"""
         if not self.enabled:
             return
-        
-        if sound_name in self.sounds:
-            self.sounds[sound_name].play()
+        try:
+            reserved = sum(self.CHANNEL_GROUPS.values())
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+            pygame.mixer.set_reserved(reserved)
+            index = 0
+            for category, count in self.CHANNEL_GROUPS.items():
+                self.groups[category] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+                index += count
+        except pygame.error as e:
+            print(f"Не удалось настроить каналы: {e}")
+            self.enabled = False
+
+    def play(self, sound_name):
+        """Воспроизведение звука по имени через планировщик каналов
+
+        Повторный запуск в пределах окна слияния отбрасывается, число голосов
+        одного звука ограничено, а при нехватке каналов группы вытесняется
+        голос с наименьшим приоритетом (из равных - самый старый).
+        """
+        if not self.enabled or not self.groups or sound_name not in self.sounds:
+            return False
+
+        category, max_voices, priority, window = self.RULES.get(sound_name, ("impact", 1, 0, 50))
+        now = pygame.time.get_ticks()
+        last = self.last_played.get(sound_name)
+        if last is not None and now - last < window:
+            self.stats["merged"] += 1
+            return False
+
+        channels = self.groups[category]
+        free = None
+        voices = 0
+        victim = None
+        for channel in channels:
+            if not channel.get_busy():
+                if free is None:
+                    free = channel
+                continue
+            name, voice_priority, started = self.voices[channel]
+            if name == sound_name:
+                voices += 1
+            if victim is None or (voice_priority, started) < self.voices[victim][1:]:
+                victim = channel
+
+        if voices >= max_voices:
+            self.stats["dropped"] += 1
+            return False
+        if free is None:
+            if victim is None or self.voices[victim][1] > priority:
+                self.stats["dropped"] += 1
+                return False
+            free = victim
+            self.stats["stolen"] += 1
+
+        free.play(self.sounds[sound_name])
+        self.voices[free] = (sound_name, priority, now)
+        self.last_played[sound_name] = now
+        self.stats["played"] += 1
+        return True
 
     def stop(self, sound_name):
         """Остановка конкретного звука"""
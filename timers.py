@@ -0,0 +1,107 @@
+"""
+Колесо таймеров игровых событий
+"""
+
+
+class Timer:
+    """Заведённый таймер: callback(*args) на тике deadline, повторный - каждые interval тиков"""
+
+    __slots__ = ("deadline", "interval", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, interval, callback, args):
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Отмена: колесо пропустит таймер, когда дойдёт до его ячейки"""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Иерархическое колесо таймеров по тикам SimClock
+
+    LEVELS уровней по SLOTS ячеек: ячейка уровня 0 - один тик, уровня 1 -
+    SLOTS тиков, уровня 2 - SLOTS ** 2 тиков. Таймер ложится на уровень,
+    в окно которого попадает его срок; когда младший уровень проходит
+    круг, очередная ячейка старшего раскладывается вниз. Тик разбирает
+    одну ячейку уровня 0, поэтому работа за тик - только сработавшие
+    таймеры (и редкие переносы), сколько бы их ни было заведено.
+    """
+
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+    LEVELS = 4
+
+    def __init__(self):
+        self.now = 0
+        self.wheels = [[[] for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        self.overflow = []  # сроки дальше всех уровней (SLOTS ** LEVELS тиков)
+        self.fired = 0
+
+    def after(self, ticks, callback, *args):
+        """Однократный вызов callback(*args) через ticks тиков"""
+        timer = Timer(self.now + max(ticks, 1), 0, callback, args)
+        self._place(timer)
+        return timer
+
+    def every(self, ticks, callback, *args, delay=None):
+        """Вызов callback(*args) каждые ticks тиков (первый - через delay, по умолчанию через ticks)"""
+        interval = max(ticks, 1)
+        first = interval if delay is None else max(delay, 1)
+        timer = Timer(self.now + first, interval, callback, args)
+        self._place(timer)
+        return timer
+
+    def _place(self, timer):
+        """Положить таймер в ячейку уровня, в окно которого попадает его срок"""
+        delta = timer.deadline - self.now
+        for level in range(self.LEVELS):
+            if delta < self.SLOTS << (self.SLOT_BITS * level):
+                slot = (timer.deadline >> (self.SLOT_BITS * level)) & (self.SLOTS - 1)
+                self.wheels[level][slot].append(timer)
+                return
+        self.overflow.append(timer)
+
+    def _cascade(self):
+        """Начало круга младшего уровня: ячейки старших уровней раскладываются вниз"""
+        now = self.now
+        for level in range(1, self.LEVELS):
+            slot = (now >> (self.SLOT_BITS * level)) & (self.SLOTS - 1)
+            timers = self.wheels[level][slot]
+            self.wheels[level][slot] = []
+            for timer in timers:
+                if not timer.cancelled:
+                    self._place(timer)
+            if slot:
+                return
+        # Все уровни прошли круг - дальние сроки входят в колесо
+        timers, self.overflow = self.overflow, []
+        for timer in timers:
+            if not timer.cancelled:
+                self._place(timer)
+
+    def advance(self, now):
+        """Прокрутить колесо до тика now, вызывая сработавшие таймеры"""
+        mask = self.SLOTS - 1
+        wheel = self.wheels[0]
+        while self.now < now:
+            self.now += 1
+            slot = self.now & mask
+            if not slot:
+                self._cascade()
+            timers = wheel[slot]
+            if not timers:
+                continue
+            wheel[slot] = []
+            for timer in timers:
+                if timer.cancelled:
+                    continue
+                self.fired += 1
+                timer.callback(*timer.args)
+                # Повторный таймер перезаводится, если callback его не отменил
+                if timer.interval and not timer.cancelled:
+                    timer.deadline = self.now + timer.interval
+                    self._place(timer)